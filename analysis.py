@@ -9,21 +9,201 @@ app = marimo.App(width="full")
 # Import libraries
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
+from matplotlib.figure import Figure
 
-# Cell 1: Data Loading and Initial Processing
-@app.cell
-def __():
-    # Load sample dataset (Iris dataset for demonstration)
+from cell_runner import CellRunner, CellTimer, LatencyStats
+from covariance import GroupedCovariance
+
+NUMERIC_COLS = ['sepal length (cm)', 'sepal width (cm)',
+                'petal length (cm)', 'petal width (cm)']
+SPECIES_COLORS = {'setosa': 'red', 'versicolor': 'blue', 'virginica': 'green'}
+
+def load_iris_data():
+    """Load the Iris dataset as a DataFrame with species labels (Cell 1)."""
     import sklearn.datasets
-    
-    # Load the iris dataset
+
     iris = sklearn.datasets.load_iris()
     df = pd.DataFrame(data=iris.data, columns=iris.feature_names)
     df['species'] = iris.target
     df['species_name'] = df['species'].map({0: 'setosa', 1: 'versicolor', 2: 'virginica'})
+    return df, iris
+
+# Selection pipeline
+# The functions below hold the work behind Cells 3-7 so it can run on a
+# CellRunner worker thread instead of blocking the kernel on every widget
+# change, with each stage timed for the latency table in Cell 8.
+
+def sample_selection(df, species, sample_size, selected_feature):
+    """Filter by species, sample, and summarise the selected feature (Cell 3)."""
+    filtered_df = df[df['species_name'].isin(species)]
+    sample_size = min(sample_size, len(filtered_df))
+    sampled_df = filtered_df.sample(n=sample_size, random_state=42)
+
+    feature = sampled_df[selected_feature]
+    feature_stats = {
+        'mean': feature.mean(),
+        'median': feature.median(),
+        'std': feature.std(),
+        'min': feature.min(),
+        'max': feature.max(),
+        'skew': feature.skew(),
+    }
+    feature_stats['range'] = feature_stats['max'] - feature_stats['min']
+    return sampled_df, feature_stats
+
+def plot_selection(sampled_df, selected_feature, corr_matrix=None):
+    """
+    Build the 2x2 analysis figure for a selection (Cell 4).
+
+    Uses the object-oriented Figure API rather than pyplot so it is safe
+    to call from a worker thread. ``corr_matrix`` is drawn in the heatmap
+    panel; when omitted it is computed from ``sampled_df``.
+    """
+    fig = Figure(figsize=(12, 10))
+    axes = fig.subplots(2, 2)
+    species_names = sampled_df['species_name'].unique()
+
+    # Plot 1: Histogram of selected feature
+    axes[0, 0].hist(sampled_df[selected_feature], bins=15, edgecolor='black', alpha=0.7)
+    axes[0, 0].set_xlabel(selected_feature)
+    axes[0, 0].set_ylabel('Frequency')
+    axes[0, 0].set_title(f'Distribution of {selected_feature}')
+    axes[0, 0].grid(True, alpha=0.3)
+
+    # Plot 2: Box plot by species
+    species_data = [sampled_df[sampled_df['species_name'] == species][selected_feature]
+                   for species in species_names]
+    axes[0, 1].boxplot(species_data)
+    axes[0, 1].set_xticklabels(species_names)
+    axes[0, 1].set_ylabel(selected_feature)
+    axes[0, 1].set_title(f'{selected_feature} by Species')
+    axes[0, 1].grid(True, alpha=0.3)
+
+    # Plot 3: Scatter plot (using sepal length vs selected feature)
+    for species in species_names:
+        species_df = sampled_df[sampled_df['species_name'] == species]
+        axes[1, 0].scatter(species_df['sepal length (cm)'],
+                          species_df[selected_feature],
+                          label=species, alpha=0.6, c=SPECIES_COLORS.get(species, 'gray'))
+    axes[1, 0].set_xlabel('sepal length (cm)')
+    axes[1, 0].set_ylabel(selected_feature)
+    axes[1, 0].set_title(f'Relationship: Sepal Length vs {selected_feature}')
+    axes[1, 0].legend()
+    axes[1, 0].grid(True, alpha=0.3)
+
+    # Plot 4: Correlation heatmap for numerical features
+    if corr_matrix is None:
+        corr_matrix = sampled_df[NUMERIC_COLS].corr()
+    im = axes[1, 1].imshow(corr_matrix, cmap='coolwarm', vmin=-1, vmax=1)
+    axes[1, 1].set_xticks(range(len(NUMERIC_COLS)))
+    axes[1, 1].set_yticks(range(len(NUMERIC_COLS)))
+    axes[1, 1].set_xticklabels(NUMERIC_COLS, rotation=45)
+    axes[1, 1].set_yticklabels(NUMERIC_COLS)
+    axes[1, 1].set_title('Feature Correlation Matrix')
+
+    # Add colorbar
+    fig.colorbar(im, ax=axes[1, 1])
+
+    fig.tight_layout()
+
+    return fig
+
+def anova_selection(sampled_df, selected_feature):
+    """
+    Run a one-way ANOVA of the selected feature across species (Cell 6).
+
+    Returns a dict whose 'status' is 'ok', 'too_few_species' or
+    'insufficient_data'; 'ok' results also carry 'f_stat' and 'p_value'.
+    """
+    species_names = sampled_df['species_name'].unique()
+    if len(species_names) < 2:
+        return {'status': 'too_few_species'}
+
+    species_groups = [sampled_df[sampled_df['species_name'] == species][selected_feature].values
+                     for species in species_names]
+    if not all(len(group) > 1 for group in species_groups):
+        return {'status': 'insufficient_data'}
+
+    f_stat, p_value = stats.f_oneway(*species_groups)
+    return {'status': 'ok', 'f_stat': f_stat, 'p_value': p_value}
+
+def export_selection_csv(sampled_df):
+    """Encode the sampled data as base64 CSV for the download link (Cell 7)."""
+    import io
+    import base64
+
+    csv_buffer = io.StringIO()
+    sampled_df.to_csv(csv_buffer, index=False)
+    return base64.b64encode(csv_buffer.getvalue().encode()).decode()
+
+def run_selection(df, species, sample_size, selected_feature, species_moments=None,
+                  token=None):
+    """
+    Run the whole Cells 3-7 pipeline for one widget selection.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Full dataset from Cell 1
+    species, sample_size, selected_feature
+        Current widget values
+    species_moments : covariance.GroupedCovariance, optional
+        Cached per-species partials; when given, the heatmap shows the
+        correlation of the selected species combined from them instead of
+        rescanning the sampled rows
+    token : cell_runner.SelectionToken, optional
+        Checked between stages so a superseded selection stops early
+
+    Returns:
+    --------
+    dict
+        Sampled data, feature statistics, figure, ANOVA result, CSV
+        payload and per-cell 'timings' in seconds
+    """
+    timer = CellTimer()
+
+    with timer.cell('Cell 3: Sampling'):
+        sampled_df, feature_stats = sample_selection(df, species, sample_size, selected_feature)
+    if token is not None:
+        token.checkpoint()
+
+    with timer.cell('Cell 4: Visualization'):
+        corr_matrix = None
+        if species_moments is not None:
+            corr_matrix = species_moments.correlation(species)
+        fig = plot_selection(sampled_df, selected_feature, corr_matrix)
+    if token is not None:
+        token.checkpoint()
+
+    with timer.cell('Cell 5: Statistics'):
+        composition = sampled_df['species_name'].value_counts().to_markdown()
+
+    with timer.cell('Cell 6: ANOVA'):
+        anova = anova_selection(sampled_df, selected_feature)
+    if token is not None:
+        token.checkpoint()
+
+    with timer.cell('Cell 7: Export'):
+        csv_b64 = export_selection_csv(sampled_df)
+
+    return {
+        'sampled_df': sampled_df,
+        'selected_feature': selected_feature,
+        'feature_stats': feature_stats,
+        'figure': fig,
+        'composition': composition,
+        'anova': anova,
+        'csv_b64': csv_b64,
+        'timings': timer.timings,
+    }
+
+# Cell 1: Data Loading and Initial Processing
+@app.cell
+def __():
+    # Load sample dataset (Iris dataset for demonstration)
+    df, iris = load_iris_data()
     
     # Display dataset info
     print("Dataset Info:")
@@ -36,7 +216,11 @@ def __():
     feature_means = df[iris.feature_names].mean().to_dict()
     feature_stds = df[iris.feature_names].std().to_dict()
     
-    return df, iris, feature_means, feature_stds
+    # Per-species co-moments: the heatmap combines these instead of
+    # recomputing corr() over the rows on every selection change
+    species_moments = GroupedCovariance.from_frame(df, 'species_name', NUMERIC_COLS)
+    
+    return df, iris, feature_means, feature_stds, species_moments
 
 # Cell 2: Interactive Slider Widget for Feature Selection
 @app.cell
@@ -51,7 +235,8 @@ def __(df):
         start=10, 
         stop=len(df), 
         step=5, 
-        value=50, 
+        value=50,
+        debounce=True,  # Only send the value when the handle is released
         label="Sample Size"
     )
     
@@ -68,6 +253,13 @@ def __(df):
         label="Select Species"
     )
     
+    # Background worker for Cells 3-7: widget changes submit work and return
+    # at once; the poller below publishes the newest finished result
+    runner = CellRunner(max_workers=2, debounce=0.15)
+    result_poll = mo.ui.refresh(options=[0.25, 1], default_interval=0.25,
+                                label="Result updates")
+    get_selection, set_selection = mo.state(None)
+    
     # Display the widgets
     mo.md(f"""
     ## Interactive Controls
@@ -76,101 +268,80 @@ def __(df):
     - **Sample Size**: {sample_slider}
     - **Feature to Analyze**: {feature_dropdown}
     - **Species to Include**: {species_checkboxes}
+    - {result_poll}
     
     *Contact: 23f2004089@ds.study.iitm.ac.in for questions*
     """)
-    
-    return sample_slider, feature_dropdown, species_checkboxes, mo
+
+    # Per-cell latencies collected across selections (shown in Cell 8)
+    latency_stats = LatencyStats()
+
+    return (sample_slider, feature_dropdown, species_checkboxes, mo, latency_stats,
+            runner, result_poll, get_selection, set_selection)
 
 # Cell 3: Data Processing with Dependencies
 @app.cell
-def __(df, sample_slider, species_checkboxes, feature_dropdown):
+def __(df, species_moments, runner, sample_slider, species_checkboxes, feature_dropdown):
     # This cell depends on the widget states from Cell 2
-    # It filters and samples the data based on user selections
-    
-    # Filter data based on selected species
-    filtered_df = df[df['species_name'].isin(species_checkboxes.value)]
+    # Filtering, sampling, plotting, ANOVA and export are submitted to the
+    # runner's worker pool and this cell returns immediately; a newer widget
+    # value supersedes the job, which then stops at its next checkpoint.
+    
+    runner.submit(
+        'selection', run_selection, df,
+        tuple(species_checkboxes.value), sample_slider.value, feature_dropdown.value,
+        species_moments=species_moments
+    )
     
-    # Sample data based on slider value
-    sample_size = min(sample_slider.value, len(filtered_df))
-    sampled_df = filtered_df.sample(n=sample_size, random_state=42)
+    return
+
+# Cell 3b: Collect the Latest Finished Selection
+@app.cell
+def __(result_poll, runner, latency_stats, set_selection):
+    # Re-run on every poll tick; only a result for the current widget values
+    # is published, so stale selections are never displayed
     
-    # Get the selected feature for analysis
-    selected_feature = feature_dropdown.value
+    result_poll.value
+    finished = runner.take('selection')
+    if finished is not None:
+        latency_stats.record(finished['timings'])
+        set_selection(finished)
     
-    # Calculate statistics for the selected feature
-    feature_mean = sampled_df[selected_feature].mean()
-    feature_median = sampled_df[selected_feature].median()
-    feature_std = sampled_df[selected_feature].std()
+    return
+
+# Cell 3c: Processed Data from the Latest Selection
+@app.cell
+def __(get_selection, mo):
+    selection = get_selection()
+    mo.stop(selection is None, mo.md("*Computing the first selection...*"))
     
     # Return processed data and statistics
-    return sampled_df, selected_feature, feature_mean, feature_median, feature_std
+    sampled_df = selection['sampled_df']
+    selected_feature = selection['selected_feature']
+    feature_mean = selection['feature_stats']['mean']
+    feature_median = selection['feature_stats']['median']
+    feature_std = selection['feature_stats']['std']
+    return selection, sampled_df, selected_feature, feature_mean, feature_median, feature_std
 
 # Cell 4: Dynamic Visualization
 @app.cell
-def __(sampled_df, selected_feature):
-    # This cell creates visualizations based on the processed data from Cell 3
+def __(selection):
+    # The figure was rendered on the runner's worker thread by plot_selection()
     
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-    
-    # Plot 1: Histogram of selected feature
-    axes[0, 0].hist(sampled_df[selected_feature], bins=15, edgecolor='black', alpha=0.7)
-    axes[0, 0].set_xlabel(selected_feature)
-    axes[0, 0].set_ylabel('Frequency')
-    axes[0, 0].set_title(f'Distribution of {selected_feature}')
-    axes[0, 0].grid(True, alpha=0.3)
-    
-    # Plot 2: Box plot by species
-    species_data = [sampled_df[sampled_df['species_name'] == species][selected_feature] 
-                   for species in sampled_df['species_name'].unique()]
-    axes[0, 1].boxplot(species_data)
-    axes[0, 1].set_xticklabels(sampled_df['species_name'].unique())
-    axes[0, 1].set_ylabel(selected_feature)
-    axes[0, 1].set_title(f'{selected_feature} by Species')
-    axes[0, 1].grid(True, alpha=0.3)
-    
-    # Plot 3: Scatter plot (using sepal length vs selected feature)
-    colors = {'setosa': 'red', 'versicolor': 'blue', 'virginica': 'green'}
-    for species in sampled_df['species_name'].unique():
-        species_df = sampled_df[sampled_df['species_name'] == species]
-        axes[1, 0].scatter(species_df['sepal length (cm)'], 
-                          species_df[selected_feature],
-                          label=species, alpha=0.6, c=colors.get(species, 'gray'))
-    axes[1, 0].set_xlabel('sepal length (cm)')
-    axes[1, 0].set_ylabel(selected_feature)
-    axes[1, 0].set_title(f'Relationship: Sepal Length vs {selected_feature}')
-    axes[1, 0].legend()
-    axes[1, 0].grid(True, alpha=0.3)
-    
-    # Plot 4: Correlation heatmap for numerical features
-    numeric_cols = ['sepal length (cm)', 'sepal width (cm)', 
-                   'petal length (cm)', 'petal width (cm)']
-    corr_matrix = sampled_df[numeric_cols].corr()
-    im = axes[1, 1].imshow(corr_matrix, cmap='coolwarm', vmin=-1, vmax=1)
-    axes[1, 1].set_xticks(range(len(numeric_cols)))
-    axes[1, 1].set_yticks(range(len(numeric_cols)))
-    axes[1, 1].set_xticklabels(numeric_cols, rotation=45)
-    axes[1, 1].set_yticklabels(numeric_cols)
-    axes[1, 1].set_title('Feature Correlation Matrix')
-    
-    # Add colorbar
-    plt.colorbar(im, ax=axes[1, 1])
-    
-    plt.tight_layout()
+    fig = selection['figure']
     
     return fig,
 
 # Cell 5: Dynamic Markdown Output with Statistics
 @app.cell
-def __(mo, sampled_df, selected_feature, feature_mean, feature_median, feature_std):
+def __(mo, selection, sampled_df, selected_feature, feature_mean, feature_median, feature_std):
     # This cell creates dynamic markdown output based on the analysis results
     # It depends on the processed data from Cell 3
     
-    # Calculate additional statistics
-    feature_min = sampled_df[selected_feature].min()
-    feature_max = sampled_df[selected_feature].max()
-    feature_range = feature_max - feature_min
-    feature_skew = sampled_df[selected_feature].skew()
+    feature_min = selection['feature_stats']['min']
+    feature_max = selection['feature_stats']['max']
+    feature_range = selection['feature_stats']['range']
+    feature_skew = selection['feature_stats']['skew']
     
     # Create dynamic markdown output
     analysis_report = mo.md(f"""
@@ -188,7 +359,7 @@ def __(mo, sampled_df, selected_feature, feature_mean, feature_median, feature_s
       ({'Right skewed' if feature_skew > 0.5 else 'Left skewed' if feature_skew < -0.5 else 'Approximately symmetric'})
     
     #### Dataset Composition:
-    {sampled_df['species_name'].value_counts().to_markdown()}
+    {selection['composition']}
     
     #### Interpretation:
     {f'The distribution shows significant variation across species.' if feature_std > 0.5 else 'The distribution is relatively tight.'}
@@ -202,37 +373,33 @@ def __(mo, sampled_df, selected_feature, feature_mean, feature_median, feature_s
 
 # Cell 6: Advanced Analysis with Hypothesis Testing
 @app.cell
-def __(sampled_df, selected_feature, mo):
-    # This cell performs hypothesis testing based on the selected data
-    # Depends on sampled_df and selected_feature from Cell 3
-    
-    if len(sampled_df['species_name'].unique()) >= 2:
-        # Perform ANOVA if we have multiple species
-        species_groups = [sampled_df[sampled_df['species_name'] == species][selected_feature].values 
-                         for species in sampled_df['species_name'].unique()]
+def __(selection, selected_feature, mo):
+    # This cell formats the ANOVA computed on the worker thread by anova_selection()
+    # Depends on the selection from Cell 3
+    
+    anova = selection['anova']
+    
+    if anova['status'] == 'ok':
+        f_stat, p_value = anova['f_stat'], anova['p_value']
+        
+        # Create markdown with hypothesis test results
+        hypothesis_test = mo.md(f"""
+        ### Hypothesis Testing Results
         
-        if all(len(group) > 1 for group in species_groups):
-            # Perform one-way ANOVA
-            f_stat, p_value = stats.f_oneway(*species_groups)
-            
-            # Create markdown with hypothesis test results
-            hypothesis_test = mo.md(f"""
-            ### Hypothesis Testing Results
-            
-            **One-Way ANOVA Test** for {selected_feature} across species:
-            
-            - **F-statistic**: {f_stat:.4f}
-            - **P-value**: {p_value:.6f}
-            - **Significance**: {'Significant difference (p < 0.05)' if p_value < 0.05 else 'No significant difference (p ≥ 0.05)'}
-            
-            **Interpretation**: {
-                'The selected feature shows statistically significant differences between species.' 
-                if p_value < 0.05 
-                else 'No significant differences detected between species for this feature.'
-            }
-            """)
-        else:
-            hypothesis_test = mo.md("### Hypothesis Testing\n*Insufficient data for ANOVA test*")
+        **One-Way ANOVA Test** for {selected_feature} across species:
+        
+        - **F-statistic**: {f_stat:.4f}
+        - **P-value**: {p_value:.6f}
+        - **Significance**: {'Significant difference (p < 0.05)' if p_value < 0.05 else 'No significant difference (p ≥ 0.05)'}
+        
+        **Interpretation**: {
+            'The selected feature shows statistically significant differences between species.' 
+            if p_value < 0.05 
+            else 'No significant differences detected between species for this feature.'
+        }
+        """)
+    elif anova['status'] == 'insufficient_data':
+        hypothesis_test = mo.md("### Hypothesis Testing\n*Insufficient data for ANOVA test*")
     else:
         hypothesis_test = mo.md("### Hypothesis Testing\n*Need at least 2 species for comparison*")
     
@@ -240,21 +407,12 @@ def __(sampled_df, selected_feature, mo):
 
 # Cell 7: Export and Summary
 @app.cell
-def __(sampled_df, mo, selected_feature):
+def __(selection, sampled_df, mo, selected_feature):
     # Final cell with export options and summary
     # Data flow: depends on sampled_df from Cell 3
     
-    # Create a download button for the sampled data
-    import io
-    import base64
-    
-    # Convert dataframe to CSV
-    csv_buffer = io.StringIO()
-    sampled_df.to_csv(csv_buffer, index=False)
-    csv_data = csv_buffer.getvalue()
-    
-    # Encode for download
-    b64 = base64.b64encode(csv_data.encode()).decode()
+    # CSV payload encoded on the worker thread by export_selection_csv()
+    b64 = selection['csv_b64']
     
     summary = mo.md(f"""
     ## Summary and Export
@@ -288,5 +446,20 @@ def __(sampled_df, mo, selected_feature):
     
     return summary,
 
+# Cell 8: Cell Latency Metrics
+@app.cell
+def __(selection, latency_stats, mo):
+    # Shows which cell is the bottleneck; refreshed after every selection
+    
+    latency_report = mo.md(f"""
+    ## Cell Latency
+    
+    {latency_stats.markdown()}
+    
+    *Measured on the background worker; slowest cell first.*
+    """)
+    
+    return latency_report,
+
 if __name__ == "__main__":
     app.run()
\ No newline at end of file
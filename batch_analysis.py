@@ -0,0 +1,223 @@
+"""
+Headless Parameter Sweep for the Analysis Notebook
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+Runs the analysis.py cell graph for every combination of feature,
+species selection and sample size, and writes the figures and
+statistics markdown to an output directory with a manifest.
+
+Usage:
+    python batch_analysis.py --output-dir snapshots --sample-sizes 25 50 150
+"""
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from analysis import NUMERIC_COLS, load_iris_data, run_selection
+from covariance import GroupedCovariance
+
+SPECIES = ['setosa', 'versicolor', 'virginica']
+DEFAULT_SAMPLE_SIZES = [25, 50, 100, 150]
+
+# Upstream results shared by every combination; set once per worker process
+_shared = {}
+
+
+def prepare_shared():
+    """
+    Compute the upstream cells once: data loading and per-species partitions.
+
+    Returns:
+    --------
+    dict
+        'partitions' maps species name to its rows; 'species_moments' holds
+        the per-species covariance partials used by the heatmap
+    """
+    df, _ = load_iris_data()
+    partitions = {name: part for name, part in df.groupby('species_name', sort=False)}
+    species_moments = GroupedCovariance.from_frame(df, 'species_name', NUMERIC_COLS)
+    return {'partitions': partitions, 'species_moments': species_moments}
+
+
+def _init_worker(shared):
+    """Process-pool initializer: install the shared upstream results."""
+    _shared.update(shared)
+
+
+def parameter_grid(features=None, species_sets=None, sample_sizes=None):
+    """
+    Build the widget value grid.
+
+    Defaults cover every feature, every non-empty species selection and
+    DEFAULT_SAMPLE_SIZES.
+    """
+    features = features or NUMERIC_COLS
+    if species_sets is None:
+        species_sets = [combo for k in range(1, len(SPECIES) + 1)
+                        for combo in itertools.combinations(SPECIES, k)]
+    sample_sizes = sample_sizes or DEFAULT_SAMPLE_SIZES
+    return [
+        {'feature': feature, 'species': tuple(species), 'sample_size': sample_size}
+        for feature, species, sample_size in itertools.product(features, species_sets,
+                                                               sample_sizes)
+    ]
+
+
+def snapshot_name(params):
+    """File-system friendly name for one grid point."""
+    feature = params['feature'].replace(' (cm)', '').replace(' ', '_')
+    species = '+'.join(params['species'])
+    return f"{feature}__{species}__n{params['sample_size']}"
+
+
+def selection_markdown(selection):
+    """Render the statistics and ANOVA sections of Cells 5 and 6 as markdown."""
+    feature = selection['selected_feature']
+    feature_stats = selection['feature_stats']
+    skew = feature_stats['skew']
+    lines = [
+        "## Analysis Results",
+        "",
+        f"### Selected Feature: **{feature}**",
+        "",
+        "#### Statistical Summary:",
+        f"- **Sample Size**: {len(selection['sampled_df'])} observations",
+        f"- **Mean**: {feature_stats['mean']:.3f}",
+        f"- **Median**: {feature_stats['median']:.3f}",
+        f"- **Standard Deviation**: {feature_stats['std']:.3f}",
+        f"- **Range**: {feature_stats['min']:.3f} to {feature_stats['max']:.3f} "
+        f"(Δ = {feature_stats['range']:.3f})",
+        f"- **Skewness**: {skew:.3f} "
+        f"({'Right skewed' if skew > 0.5 else 'Left skewed' if skew < -0.5 else 'Approximately symmetric'})",
+        "",
+        "#### Dataset Composition:",
+        selection['composition'],
+        "",
+        "### Hypothesis Testing",
+    ]
+
+    anova = selection['anova']
+    if anova['status'] == 'ok':
+        significant = anova['p_value'] < 0.05
+        lines += [
+            f"**One-Way ANOVA Test** for {feature} across species:",
+            "",
+            f"- **F-statistic**: {anova['f_stat']:.4f}",
+            f"- **P-value**: {anova['p_value']:.6f}",
+            f"- **Significance**: "
+            f"{'Significant difference (p < 0.05)' if significant else 'No significant difference (p ≥ 0.05)'}",
+        ]
+    elif anova['status'] == 'insufficient_data':
+        lines.append("*Insufficient data for ANOVA test*")
+    else:
+        lines.append("*Need at least 2 species for comparison*")
+
+    return "\n".join(lines) + "\n"
+
+
+def run_snapshot(params, output_dir):
+    """Run the cell graph for one grid point and write its outputs."""
+    partitions = _shared['partitions']
+    # Restore the original row order so sampling matches the notebook
+    subset = pd.concat([partitions[name] for name in params['species']]).sort_index()
+
+    selection = run_selection(subset, params['species'], params['sample_size'],
+                              params['feature'],
+                              species_moments=_shared['species_moments'])
+
+    name = snapshot_name(params)
+    figure_path = os.path.join(output_dir, f"{name}.png")
+    report_path = os.path.join(output_dir, f"{name}.md")
+    selection['figure'].savefig(figure_path, dpi=100)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(selection_markdown(selection))
+
+    return {
+        'name': name,
+        'feature': params['feature'],
+        'species': list(params['species']),
+        'sample_size': params['sample_size'],
+        'figure': os.path.basename(figure_path),
+        'report': os.path.basename(report_path),
+        'timings': selection['timings'],
+    }
+
+
+def _manifest_files(output_dir):
+    """Figure and report files listed in the directory's existing manifest.json."""
+    try:
+        with open(os.path.join(output_dir, 'manifest.json'), encoding='utf-8') as f:
+            snapshots = json.load(f)['snapshots']
+    except (OSError, ValueError, KeyError):
+        return set()
+    return {entry[kind] for entry in snapshots for kind in ('figure', 'report')}
+
+
+def run_batch(output_dir, grid, max_workers=None):
+    """
+    Run every grid point in a process pool and write manifest.json.
+
+    Snapshots listed by a previous manifest in ``output_dir`` but not
+    produced by this sweep are deleted, so the directory always matches
+    its manifest. Other files are left alone.
+
+    Returns:
+    --------
+    list of dict
+        Manifest entries, in grid order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    previous_files = _manifest_files(output_dir)
+    shared = prepare_shared()
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(shared,)) as pool:
+        entries = list(pool.map(run_snapshot, grid, itertools.repeat(output_dir)))
+
+    manifest = {
+        'generated': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'count': len(entries),
+        'snapshots': entries,
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    current_files = {entry[kind] for entry in entries for kind in ('figure', 'report')}
+    for filename in previous_files - current_files:
+        path = os.path.join(output_dir, os.path.basename(filename))
+        if os.path.exists(path):
+            os.remove(path)
+    return entries
+
+
+def main(argv=None):
+    """Command line entry point for the parameter sweep."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--output-dir', default='snapshots',
+                        help='directory for figures, reports and manifest.json')
+    parser.add_argument('--features', nargs='+', choices=NUMERIC_COLS,
+                        help='features to sweep (default: all)')
+    parser.add_argument('--species', nargs='+', action='append', choices=SPECIES,
+                        dest='species_sets', metavar='SPECIES',
+                        help='one species selection; repeat for several '
+                             '(default: every non-empty combination)')
+    parser.add_argument('--sample-sizes', nargs='+', type=int,
+                        help=f'sample sizes (default: {DEFAULT_SAMPLE_SIZES})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    grid = parameter_grid(args.features, args.species_sets, args.sample_sizes)
+    print(f"Running {len(grid)} snapshots into '{args.output_dir}'...")
+    entries = run_batch(args.output_dir, grid, max_workers=args.workers)
+    print(f"✓ Wrote {len(entries)} snapshots and manifest.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark Definitions for Data Generation, Aggregation, Rendering and Reports
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+Each benchmark is a (setup, run) pair: ``setup(n_rows)`` builds inputs
+outside the timed region and returns a state object, ``run(state)`` is
+the timed call. run_benchmarks.py times every benchmark for each
+dataset size.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analysis
+import chart
+import employee_analysis
+from covariance import GroupedCovariance
+
+DEPARTMENTS = ['IT', 'HR', 'Finance', 'Marketing', 'Operations', 'Sales']
+
+
+def make_employee_data(n_rows):
+    """Employee dataset of n_rows with the columns create_sample_data produces."""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'Employee_ID': np.arange(1001, 1001 + n_rows),
+        'Name': [f'Employee_{i}' for i in range(n_rows)],
+        'Department': rng.choice(DEPARTMENTS, n_rows, p=[0.4, 0.12, 0.12, 0.12, 0.12, 0.12]),
+        'Salary': rng.normal(60000, 15000, n_rows),
+        'Years_Experience': rng.integers(1, 20, n_rows),
+    })
+
+
+def make_iris_data(n_rows):
+    """Iris-like dataset of n_rows: resampled Iris rows with small jitter."""
+    df, _ = analysis.load_iris_data()
+    rng = np.random.default_rng(42)
+    rows = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    rows[analysis.NUMERIC_COLS] += rng.normal(0, 0.05, (n_rows, len(analysis.NUMERIC_COLS)))
+    return rows
+
+
+# chart.py
+
+def setup_marketing(n_rows):
+    return chart.generate_marketing_data(n_rows)
+
+
+def run_generate_marketing_data(n_rows):
+    chart.generate_marketing_data(n_rows)
+
+
+def run_marketing_scatterplot(df):
+    fig = chart.create_marketing_scatterplot(df)
+    fig.savefig(io.BytesIO(), format='png', dpi=80, facecolor='white', edgecolor='none')
+    plt.close(fig)
+
+
+# employee_analysis.py
+
+def run_analyze_departments(df):
+    with contextlib.redirect_stdout(io.StringIO()):
+        fig, _ = employee_analysis.analyze_departments(df)
+    plt.close(fig)
+
+
+def setup_employee_report(n_rows):
+    df = make_employee_data(n_rows)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fig, dept_counts = employee_analysis.analyze_departments(df)
+    return df, fig, dept_counts
+
+
+def run_save_as_html(state):
+    df, fig, dept_counts = state
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                employee_analysis.save_as_html(df, fig, dept_counts)
+        finally:
+            os.chdir(cwd)
+
+
+def run_fig_to_base64(state):
+    employee_analysis.fig_to_base64(state[1])
+
+
+# analysis.py notebook cells
+
+def setup_selection(n_rows):
+    df = make_iris_data(n_rows)
+    sampled_df, _ = analysis.sample_selection(df, ['setosa', 'versicolor', 'virginica'],
+                                              n_rows, 'petal length (cm)')
+    return df, sampled_df
+
+
+def run_sample_selection(state):
+    df, _ = state
+    analysis.sample_selection(df, ['setosa', 'virginica'], len(df), 'petal length (cm)')
+
+
+def run_plot_selection(state):
+    fig = analysis.plot_selection(state[1], 'petal length (cm)')
+    fig.savefig(io.BytesIO(), format='png')
+
+
+def run_anova_selection(state):
+    analysis.anova_selection(state[1], 'petal length (cm)')
+
+
+def run_export_selection_csv(state):
+    analysis.export_selection_csv(state[1])
+
+
+def run_species_moments(state):
+    GroupedCovariance.from_frame(state[0], 'species_name', analysis.NUMERIC_COLS)
+
+
+# name -> (setup, run); setup=None times run(n_rows) directly
+BENCHMARKS = {
+    'chart.generate_marketing_data': (None, run_generate_marketing_data),
+    'chart.create_marketing_scatterplot+save': (setup_marketing, run_marketing_scatterplot),
+    'employee_analysis.analyze_departments': (make_employee_data, run_analyze_departments),
+    'employee_analysis.save_as_html': (setup_employee_report, run_save_as_html),
+    'employee_analysis.fig_to_base64': (setup_employee_report, run_fig_to_base64),
+    'analysis.sample_selection': (setup_selection, run_sample_selection),
+    'analysis.plot_selection': (setup_selection, run_plot_selection),
+    'analysis.anova_selection': (setup_selection, run_anova_selection),
+    'analysis.export_selection_csv': (setup_selection, run_export_selection_csv),
+    'analysis.species_moments': (setup_selection, run_species_moments),
+}
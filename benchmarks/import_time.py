@@ -0,0 +1,145 @@
+"""
+Cold-Start Import Benchmark for the Stats-Only CLI Path
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+Measures module import time with ``python -X importtime`` in fresh
+interpreters, comparing the lazy-import scripts against an "eager"
+baseline that imports the plotting stack up front the way the scripts
+used to. Also times complete ``--stats-only`` runs end to end.
+
+Usage:
+    python benchmarks/import_time.py --repeat 5 --output import_time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLOTTING_MODULES = ('matplotlib', 'seaborn', 'PIL')
+
+# Scenario -> code run with -X importtime. The eager variants pre-import
+# what chart.py / employee_analysis.py loaded at module level before the
+# plotting imports became lazy.
+IMPORT_SCENARIOS = {
+    'chart (lazy)': 'import chart',
+    'chart (eager baseline)': 'import seaborn, matplotlib.pyplot; import chart',
+    'employee_analysis (lazy)': 'import employee_analysis',
+    'employee_analysis (eager baseline)':
+        'import matplotlib.pyplot, seaborn; import employee_analysis',
+}
+
+# Scenario -> full stats-only run, timed as wall clock of the whole process
+RUN_SCENARIOS = {
+    'chart --stats-only (lazy)':
+        "import chart; chart.main(['--stats-only'])",
+    'chart --stats-only (eager baseline)':
+        "import seaborn, matplotlib.pyplot; import chart; chart.main(['--stats-only'])",
+    'employee_analysis --stats-only (lazy)':
+        "import employee_analysis; employee_analysis.main(['--stats-only'])",
+    'employee_analysis --stats-only (eager baseline)':
+        "import matplotlib.pyplot, seaborn; import employee_analysis; "
+        "employee_analysis.main(['--stats-only'])",
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+    --------
+    tuple of (dict, set)
+        Top-level module name -> cumulative microseconds, and the names
+        of every module imported (nested ones included)
+    """
+    modules, loaded = {}, set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        loaded.add(name.strip())
+        # Nested imports are indented under the module that triggered them
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative)
+    return modules, loaded
+
+
+def measure_imports(code):
+    """Run ``code`` with -X importtime in a fresh interpreter."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True, check=True,
+                          env=dict(os.environ, MPLBACKEND='Agg'))
+    return parse_importtime(proc.stderr)
+
+
+def measure_run(code):
+    """Wall-clock seconds for a fresh interpreter running ``code``."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, env=dict(os.environ, MPLBACKEND='Agg'))
+    return time.perf_counter() - start
+
+
+def run(repeat=5):
+    """Measure every scenario ``repeat`` times and return the medians."""
+    results = {'imports': {}, 'runs': {}}
+    for name, code in IMPORT_SCENARIOS.items():
+        samples = [measure_imports(code) for _ in range(repeat)]
+        totals = [sum(modules.values()) / 1000 for modules, _ in samples]
+        modules, loaded = samples[-1]
+        results['imports'][name] = {
+            'total_ms': statistics.median(totals),
+            'plotting_loaded': sorted({m.split('.')[0] for m in loaded
+                                       if m.split('.')[0] in PLOTTING_MODULES}),
+            'slowest': sorted(modules.items(), key=lambda item: -item[1])[:5],
+        }
+    for name, code in RUN_SCENARIOS.items():
+        results['runs'][name] = {
+            'wall_ms': statistics.median(measure_run(code) for _ in range(repeat)) * 1000,
+        }
+    return results
+
+
+def report(results):
+    """Print import totals and lazy vs eager speedups."""
+    print(f"{'Import scenario':<38} {'Total':>10}  Plotting modules loaded")
+    for name, row in results['imports'].items():
+        loaded = ', '.join(row['plotting_loaded']) or 'none'
+        print(f"{name:<38} {row['total_ms']:>8.1f}ms  {loaded}")
+
+    print(f"\n{'Stats-only run':<48} {'Wall':>10}")
+    for name, row in results['runs'].items():
+        print(f"{name:<48} {row['wall_ms']:>8.1f}ms")
+
+    print()
+    for script in ('chart', 'employee_analysis'):
+        lazy = results['imports'][f'{script} (lazy)']['total_ms']
+        eager = results['imports'][f'{script} (eager baseline)']['total_ms']
+        print(f"{script}: import {eager:.0f}ms -> {lazy:.0f}ms "
+              f"({eager / lazy:.1f}x faster cold start)")
+
+
+def main(argv=None):
+    """Command line entry point for the import-time benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='fresh interpreters per scenario (default: 5)')
+    parser.add_argument('--output', help='also write the results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark Runner with JSON Results and Regression Check
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+Times every benchmark in bench_suite.py for a range of dataset sizes,
+writes the results as JSON (one file per commit) and optionally
+compares them with an earlier run. Runs fully offline.
+
+Usage:
+    python benchmarks/run_benchmarks.py --max-size 1e5
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<sha>.json --threshold 0.2
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+import matplotlib.pyplot as plt
+
+from bench_suite import BENCHMARKS
+
+SIZES = [100, 1000, 10_000, 100_000, 1_000_000, 10_000_000]
+# Benchmarks faster than this get extra repeats so their min is stable
+SHORT_BENCHMARK_S = 0.010
+SHORT_REPEAT = 25
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def git_commit():
+    """Short hash of HEAD, or 'unknown' outside a git checkout."""
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                             text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def time_call(fn, arg, repeat, budget):
+    """
+    Time ``fn(arg)`` up to ``repeat`` times within ``budget`` seconds.
+
+    The first call doubles as warm-up; it is kept only when it is the
+    sole sample (very slow benchmarks). Calls faster than
+    SHORT_BENCHMARK_S are repeated at least SHORT_REPEAT times.
+
+    Returns:
+    --------
+    list of float
+        Wall-clock seconds per call
+    """
+    start = time.perf_counter()
+    fn(arg)
+    first = time.perf_counter() - start
+
+    if first < SHORT_BENCHMARK_S:
+        repeat = max(repeat, SHORT_REPEAT)
+    samples = []
+    n_more = min(repeat, int(budget // first)) if first > 0 else repeat
+    for _ in range(n_more):
+        gc.collect()
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return samples or [first]
+
+
+def run_suite(sizes, pattern=None, repeat=5, budget=10.0):
+    """Run every matching benchmark for every size and return the results dict."""
+    results = {}
+    for name, (setup, run) in BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        for n_rows in sizes:
+            key = f"{name}[{n_rows}]"
+            state = setup(n_rows) if setup is not None else n_rows
+            samples = time_call(run, state, repeat, budget)
+            samples.sort()
+            results[key] = {
+                'benchmark': name,
+                'n_rows': n_rows,
+                'min': samples[0],
+                'median': samples[len(samples) // 2],
+                'max': samples[-1],
+                'samples': len(samples),
+            }
+            print(f"{key:<55} min {results[key]['min'] * 1000:>10.2f} ms "
+                  f"({len(samples)} runs)")
+            del state
+            plt.close('all')
+    return results
+
+
+def compare(current, baseline, threshold, noise_floor=0.005):
+    """
+    Compare minimum timings with a baseline run.
+
+    The min is the least noisy estimate of a benchmark's cost. A slowdown
+    only counts when it also exceeds ``noise_floor`` seconds, so jitter on
+    millisecond-scale benchmarks does not fail the check.
+
+    Returns:
+    --------
+    list of str
+        Keys whose min grew by more than ``threshold`` (fraction) and
+        ``noise_floor``
+    """
+    regressions = []
+    print(f"\n{'Benchmark':<55} {'Baseline':>10} {'Current':>10} {'Ratio':>7}")
+    for key, row in current.items():
+        if key not in baseline:
+            continue
+        before, after = baseline[key]['min'], row['min']
+        ratio = after / before
+        flag = ''
+        if ratio > 1 + threshold:
+            if after - before > noise_floor:
+                regressions.append(key)
+                flag = '  ✗ REGRESSION'
+            else:
+                flag = '  (within noise floor)'
+        print(f"{key:<55} {before * 1000:>8.2f}ms {after * 1000:>8.2f}ms {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--max-size', type=float, default=1e5,
+                        help='largest dataset size to run, up to 1e7 (default: 1e5)')
+    parser.add_argument('--sizes', nargs='+', type=float,
+                        help='explicit dataset sizes (overrides --max-size)')
+    parser.add_argument('--filter', dest='pattern',
+                        help='regex selecting benchmark names')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='timed runs per benchmark and size (default: 5)')
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help='seconds allowed for repeats per benchmark and size')
+    parser.add_argument('--output', help='results JSON path '
+                                         '(default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='baseline results JSON to check against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown before failing, as a fraction (default: 0.2)')
+    parser.add_argument('--noise-floor', type=float, default=5.0,
+                        help='ignore slowdowns smaller than this many ms (default: 5)')
+    args = parser.parse_args(argv)
+
+    sizes = [int(n) for n in args.sizes] if args.sizes else \
+        [n for n in SIZES if n <= args.max_size]
+    commit = git_commit()
+    results = run_suite(sizes, args.pattern, args.repeat, args.budget)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold,
+                              args.noise_floor / 1000)
+        if regressions:
+            print(f"\n✗ {len(regressions)} benchmark(s) slower than "
+                  f"{args.threshold:.0%} threshold")
+            return 1
+        print(f"\n✓ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
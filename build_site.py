@@ -0,0 +1,244 @@
+"""
+Parallel, Cached Build of the Site Artifacts Published to Pages
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+Models the generated files as a dependency graph of tasks. Independent
+tasks run concurrently, each in its own Python process; a task is
+skipped when the hash of its code and inputs matches the last
+successful build and its outputs are still the files that build wrote.
+The critical path is reported at the end.
+
+Usage:
+    python build_site.py              # build everything that changed
+    python build_site.py --force      # rebuild all tasks
+    python build_site.py chart -j 1   # build one task (and its dependencies)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from instrumentation import TRACE_ENV
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(ROOT, '.build_cache.json')
+
+# name -> script to run, files that affect its output, files it produces,
+# and tasks that must finish first
+TASKS = {
+    'chart': {
+        'command': ['chart.py'],
+        'inputs': ['chart.py', 'image_encoding.py', 'instrumentation.py'],
+        'outputs': ['chart.png'],
+        'deps': [],
+    },
+    'employee_analysis': {
+        'command': ['employee_analysis.py'],
+        'inputs': ['employee_analysis.py', 'image_encoding.py', 'instrumentation.py'],
+        'outputs': ['employee_analysis.html', 'department_distribution.png'],
+        'deps': [],
+    },
+}
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(os.path.join(ROOT, path), 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def task_hash(name, tasks, hashes):
+    """
+    Hash a task's command, input files and the hashes of its dependencies.
+
+    ``hashes`` holds the already computed hashes of upstream tasks, so a
+    change anywhere upstream invalidates everything downstream.
+    """
+    task = tasks[name]
+    digest = hashlib.sha256()
+    digest.update(json.dumps(task['command']).encode())
+    for path in sorted(task['inputs']):
+        digest.update(path.encode())
+        digest.update(file_digest(path).encode())
+    for dep in sorted(task['deps']):
+        digest.update(hashes[dep].encode())
+    return digest.hexdigest()
+
+
+def outputs_digest(task):
+    """Map each of a task's outputs to its SHA-256, or None if any is missing."""
+    if not all(os.path.exists(os.path.join(ROOT, out)) for out in task['outputs']):
+        return None
+    return {out: file_digest(out) for out in task['outputs']}
+
+
+def topological_order(tasks, targets=None):
+    """Return the requested tasks and their dependencies, dependencies first."""
+    order, seen = [], set()
+
+    def visit(name, trail):
+        if name in trail:
+            raise ValueError(f"Dependency cycle: {' -> '.join(trail + (name,))}")
+        if name in seen:
+            return
+        if name not in tasks:
+            raise KeyError(f"Unknown task '{name}'")
+        for dep in tasks[name]['deps']:
+            visit(dep, trail + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for name in targets or tasks:
+        visit(name, ())
+    return order
+
+
+def load_cache():
+    try:
+        with open(CACHE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def run_task(name, task):
+    """Run one task's script in a separate Python process."""
+    env = dict(os.environ, MPLBACKEND='Agg')
+    # Concurrent tasks would all overwrite the same trace file
+    env.pop(TRACE_ENV, None)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable] + task['command'], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    return proc, time.perf_counter() - start
+
+
+def critical_path(order, tasks, durations):
+    """
+    Longest chain of dependent tasks by duration.
+
+    Returns:
+    --------
+    tuple of (list of str, float)
+        Task names along the path and its total seconds
+    """
+    finish, previous = {}, {}
+    for name in order:
+        deps = tasks[name]['deps']
+        upstream = max(deps, key=lambda dep: finish[dep], default=None)
+        previous[name] = upstream
+        finish[name] = (finish[upstream] if upstream else 0.0) + durations.get(name, 0.0)
+
+    end = max(order, key=lambda name: finish[name])
+    path = [end]
+    while previous[path[-1]]:
+        path.append(previous[path[-1]])
+    return path[::-1], finish[end]
+
+
+def build(targets=None, force=False, jobs=None, tasks=TASKS):
+    """
+    Build the requested tasks, running independent ones concurrently.
+
+    Returns:
+    --------
+    bool
+        True if every task succeeded or was up to date
+    """
+    order = topological_order(tasks, targets)
+    cache = load_cache()
+    hashes, durations, status = {}, {}, {}
+    pending = list(order)
+    running = {}
+    build_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        while pending or running:
+            for name in list(pending):
+                task = tasks[name]
+                if any(status.get(dep) == 'failed' for dep in task['deps']):
+                    pending.remove(name)
+                    status[name] = 'failed'
+                    print(f"✗ {name}: skipped, a dependency failed")
+                    continue
+                if not all(status.get(dep) in ('built', 'cached') for dep in task['deps']):
+                    continue
+
+                pending.remove(name)
+                hashes[name] = task_hash(name, tasks, hashes)
+                # Outputs checked out from git or left by another build
+                # don't match the recorded digests and are rebuilt
+                entry = cache.get(name)
+                if not force and isinstance(entry, dict) and entry['hash'] == hashes[name] \
+                        and outputs_digest(task) == entry['outputs']:
+                    status[name] = 'cached'
+                    durations[name] = 0.0
+                    print(f"• {name}: up to date")
+                    continue
+
+                print(f"▶ {name}: running {' '.join(task['command'])}")
+                running[pool.submit(run_task, name, task)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                proc, seconds = future.result()
+                durations[name] = seconds
+                if proc.returncode == 0:
+                    status[name] = 'built'
+                    cache[name] = {'hash': hashes[name], 'outputs': outputs_digest(tasks[name])}
+                    print(f"✓ {name}: built in {seconds:.2f}s")
+                else:
+                    status[name] = 'failed'
+                    cache.pop(name, None)
+                    print(f"✗ {name}: failed after {seconds:.2f}s (exit {proc.returncode})")
+                    print(proc.stderr.rstrip())
+
+    save_cache(cache)
+
+    total = time.perf_counter() - build_start
+    path, path_seconds = critical_path(order, tasks, durations)
+    print("\n=== Build Summary ===")
+    for name in order:
+        print(f"{name:<20} {status[name]:<8} {durations.get(name, 0.0):>7.2f}s")
+    print(f"\nCritical path: {' -> '.join(path)} ({path_seconds:.2f}s)")
+    print(f"Total build time: {total:.2f}s")
+
+    return all(state != 'failed' for state in status.values())
+
+
+def main(argv=None):
+    """Command line entry point for the site build."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('targets', nargs='*', metavar='TASK',
+                        help=f"tasks to build (default: all of {', '.join(TASKS)})")
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the cache and rebuild every task')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='maximum concurrent tasks (default: CPU count)')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.targets if name not in TASKS]
+    if unknown:
+        parser.error(f"unknown task(s): {', '.join(unknown)}")
+
+    ok = build(args.targets or None, force=args.force, jobs=args.jobs)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Debounced Background Execution for Notebook Cells
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+The marimo kernel runs one cell at a time, so a cell that waits for slow
+work blocks every widget change queued behind it. ``CellRunner.submit``
+therefore returns immediately; the notebook collects finished results
+from a polling cell with ``CellRunner.take`` and publishes them through
+``mo.state``. Results for superseded widget values are never returned.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StaleSelection(Exception):
+    """Raised inside a job when a newer widget value has superseded it."""
+
+
+class SelectionToken:
+    """Handle passed to background jobs so they can stop early when stale."""
+
+    def __init__(self, runner, key, generation):
+        self._runner = runner
+        self.key = key
+        self.generation = generation
+
+    def is_stale(self):
+        """Return True if a newer submission exists for the same key."""
+        return self._runner.generation(self.key) != self.generation
+
+    def checkpoint(self):
+        """Abort the current job if it is no longer the latest selection."""
+        if self.is_stale():
+            raise StaleSelection(f"{self.key} generation {self.generation} superseded")
+
+
+class CellRunner:
+    """
+    Run slow notebook cells on a worker thread pool, keeping only the latest result.
+
+    Every call to ``submit`` for a given key supersedes the previous one:
+    jobs still waiting out the debounce window never start, and jobs
+    already running see their token go stale and stop at the next
+    ``token.checkpoint()``.
+
+    Parameters:
+    -----------
+    max_workers : int
+        Size of the worker pool
+    debounce : float
+        Seconds to wait for further widget changes before starting a job
+    """
+
+    def __init__(self, max_workers=2, debounce=0.15):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._timers = {}
+        self._results = {}
+
+    def generation(self, key):
+        """Return the generation number of the latest submission for key."""
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def submit(self, key, fn, *args, **kwargs):
+        """
+        Schedule ``fn(*args, token=..., **kwargs)`` once the debounce window passes.
+
+        Does not wait for the job; collect its result with ``take(key)``.
+
+        Returns:
+        --------
+        int
+            Generation number of this submission
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._timers.pop(key, None)
+            timer = threading.Timer(self.debounce, self._launch,
+                                    (SelectionToken(self, key, generation), fn, args, kwargs))
+            timer.daemon = True
+            self._timers[key] = timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+        return generation
+
+    def _launch(self, token, fn, args, kwargs):
+        with self._lock:
+            if self._timers.get(token.key) is threading.current_thread():
+                del self._timers[token.key]
+        if not token.is_stale():
+            self._executor.submit(self._run, token, fn, args, kwargs)
+
+    def _run(self, token, fn, args, kwargs):
+        """Worker body: run the job and keep its outcome if it is still current."""
+        if token.is_stale():
+            return
+        try:
+            outcome = (fn(*args, token=token, **kwargs), None)
+        except StaleSelection:
+            return
+        except Exception as exc:
+            outcome = (None, exc)
+        with self._lock:
+            if self._generations.get(token.key) == token.generation:
+                self._results[token.key] = (token.generation,) + outcome
+
+    def take(self, key):
+        """
+        Return the latest finished result for ``key`` once, or None.
+
+        None means nothing new has finished since the last call, or that
+        the finished job was superseded. A job's exception is re-raised.
+        """
+        with self._lock:
+            entry = self._results.pop(key, None)
+            current = self._generations.get(key, 0)
+        if entry is None or entry[0] != current:
+            return None
+        _, result, error = entry
+        if error is not None:
+            raise error
+        return result
+
+    def shutdown(self):
+        """Stop pending timers and the worker pool without waiting for running jobs."""
+        with self._lock:
+            timers = list(self._timers.values())
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CellTimer:
+    """Collect wall-clock latency for each named cell of a pipeline run."""
+
+    def __init__(self):
+        self.timings = {}
+
+    def cell(self, name):
+        """Context manager timing the block as cell ``name``."""
+        return _TimedBlock(self.timings, name)
+
+
+class _TimedBlock:
+    def __init__(self, timings, name):
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._timings[self._name] = time.perf_counter() - self._start
+        return False
+
+
+class LatencyStats:
+    """Accumulate CellTimer measurements across runs and summarise them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+
+    def record(self, timings):
+        """Add ``{cell_name: seconds}`` measurements to the latency metrics."""
+        with self._lock:
+            for cell, seconds in timings.items():
+                self._latencies.setdefault(cell, []).append(seconds)
+
+    def summary(self):
+        """Return count, last, mean and max latency (seconds) for every cell."""
+        with self._lock:
+            return {
+                cell: {
+                    'count': len(samples),
+                    'last': samples[-1],
+                    'mean': sum(samples) / len(samples),
+                    'max': max(samples),
+                }
+                for cell, samples in self._latencies.items()
+            }
+
+    def markdown(self):
+        """Render per-cell latencies as a markdown table, slowest cell first."""
+        summary = self.summary()
+        lines = ["| Cell | Runs | Last (ms) | Mean (ms) | Max (ms) |",
+                 "|------|------|-----------|-----------|----------|"]
+        for cell, row in sorted(summary.items(), key=lambda item: -item[1]['mean']):
+            lines.append(f"| {cell} | {row['count']} | {row['last'] * 1000:.1f} | "
+                         f"{row['mean'] * 1000:.1f} | {row['max'] * 1000:.1f} |")
+        return "\n".join(lines)
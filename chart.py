@@ -4,11 +4,23 @@ Author: 23f2004089@ds.study.iitm.ac.in
 Date: November 2024
 """
 
-import seaborn as sns
-import matplotlib.pyplot as plt
+import argparse
+
 import pandas as pd
 import numpy as np
 
+import instrumentation
+from image_encoding import DEFAULT_PRESET, PNG_PRESETS, encode_figure
+from instrumentation import stage
+
+# Custom color palette for campaign types; the scatterplot accepts only these
+CAMPAIGN_PALETTE = {
+    'Digital': '#2E86AB',      # Professional blue
+    'Social Media': '#A23B72',  # Modern magenta
+    'Email': '#F18F01',         # Attention-grabbing orange
+    'TV': '#C73E1D'            # Bold red
+}
+
 def generate_marketing_data(n_samples=200):
     """
     Generate realistic synthetic marketing campaign data.
@@ -91,6 +103,10 @@ def create_marketing_scatterplot(df):
     matplotlib.figure.Figure
         The created figure object
     """
+    # Imported here so stats-only runs never load the plotting stack
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+    
     # Set professional Seaborn styling
     sns.set_style("whitegrid")
     sns.set_context("notebook", font_scale=1.2)
@@ -99,14 +115,6 @@ def create_marketing_scatterplot(df):
     # Using figsize=(6.4, 6.4) and dpi=80 gives exactly 512x512
     fig = plt.figure(figsize=(6.4, 6.4), dpi=80, facecolor='white')
     
-    # Define custom color palette for campaign types
-    campaign_palette = {
-        'Digital': '#2E86AB',      # Professional blue
-        'Social Media': '#A23B72',  # Modern magenta
-        'Email': '#F18F01',         # Attention-grabbing orange
-        'TV': '#C73E1D'            # Bold red
-    }
-    
     # Create scatterplot with enhanced aesthetics
     scatter = sns.scatterplot(
         data=df,
@@ -118,7 +126,7 @@ def create_marketing_scatterplot(df):
         alpha=0.7,
         edgecolor='black',
         linewidth=0.5,
-        palette=campaign_palette,
+        palette=CAMPAIGN_PALETTE,
         legend='full'
     )
     
@@ -184,82 +192,108 @@ def create_marketing_scatterplot(df):
     
     return fig
 
-def main():
-    """Main function to generate and save the visualization."""
-    print("Generating marketing campaign data...")
-    df = generate_marketing_data()
-    
-    print(f"Generated {len(df)} data points")
-    print(f"Campaign types: {df['Campaign_Type'].unique().tolist()}")
-    print(f"Spend range: ${df['Marketing_Spend_K'].min():.2f}K - ${df['Marketing_Spend_K'].max():.2f}K")
-    print(f"Conversion range: {df['Conversion_Rate'].min():.2f}% - {df['Conversion_Rate'].max():.2f}%")
+def save_chart(df, image_preset=DEFAULT_PRESET):
+    """
+    Render the scatterplot and save it as a 512x512 'chart.png'.
     
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame containing marketing data
+    image_preset : str
+        PNG encoding preset from image_encoding.ENCODING_PRESETS
+    """
     print("\nCreating professional scatterplot...")
-    fig = create_marketing_scatterplot(df)
+    with stage('layout'):
+        fig = create_marketing_scatterplot(df)
     
     # Save the figure with exact 512x512 pixel dimensions
     print("\nSaving chart as 'chart.png' (512x512 pixels)...")
     
-    # Method 1: Save with exact dimensions
-    # Remove bbox_inches='tight' to maintain exact size
-    fig.savefig(
-        'chart.png',
-        dpi=80,  # 80 DPI × 6.4 inches = 512 pixels
-        bbox_inches=None,  # Do NOT use tight bounding box
-        pad_inches=0.1,    # Small padding instead
-        facecolor='white',
-        edgecolor='none'
-    )
-    
-    # Alternative method using set_size_inches
-    fig.set_size_inches(6.4, 6.4)  # Exactly 6.4 inches
-    
-    # Save again with exact dimensions
-    fig.savefig(
-        'chart.png',
-        dpi=80,
-        facecolor='white',
-        edgecolor='none'
-    )
+    # Render once at exact dimensions (80 DPI × 6.4 inches = 512 pixels,
+    # no tight bounding box), then re-encode as an optimized PNG
+    fig.set_size_inches(6.4, 6.4)
+    with stage('image_output'):
+        encoded = encode_figure(
+            fig,
+            preset=image_preset,
+            measure_baseline=True,
+            dpi=80,
+            facecolor='white',
+            edgecolor='none'
+        )
+        encoded.save('chart.png')
+    print(f"Encoded {encoded.summary()}")
     
     # Verify the output dimensions
-    from PIL import Image
-    img = Image.open('chart.png')
-    width, height = img.size
-    print(f"Saved image dimensions: {width}×{height} pixels")
+    with stage('verification'):
+        from PIL import Image
+        img = Image.open('chart.png')
+        width, height = img.size
+        print(f"Saved image dimensions: {width}×{height} pixels")
     
-    if width == 512 and height == 512:
-        print("✓ Successfully created 512×512 pixel visualization!")
-    else:
-        print(f"✗ Image dimensions are {width}×{height}, trying alternative method...")
+        if width == 512 and height == 512:
+            print("✓ Successfully created 512×512 pixel visualization!")
+        else:
+            print(f"✗ Image dimensions are {width}×{height}, trying alternative method...")
         
-        # Force exact dimensions using PIL
-        img = Image.open('chart.png')
-        img_resized = img.resize((512, 512), Image.Resampling.LANCZOS)
-        img_resized.save('chart.png')
+            # Force exact dimensions using PIL
+            img = Image.open('chart.png')
+            img_resized = img.resize((512, 512), Image.Resampling.LANCZOS)
+            img_resized.save('chart.png')
         
-        # Verify again
-        img_final = Image.open('chart.png')
-        width_final, height_final = img_final.size
-        print(f"Final image dimensions: {width_final}×{height_final} pixels")
+            # Verify again
+            img_final = Image.open('chart.png')
+            width_final, height_final = img_final.size
+            print(f"Final image dimensions: {width_final}×{height_final} pixels")
         
-        if width_final == 512 and height_final == 512:
-            print("✓ Successfully resized to 512×512 pixels!")
-        else:
-            print("✗ Could not achieve 512×512 dimensions")
+            if width_final == 512 and height_final == 512:
+                print("✓ Successfully resized to 512×512 pixels!")
+            else:
+                print("✗ Could not achieve 512×512 dimensions")
+
+def main(argv=None):
+    """Main function to generate and save the visualization."""
+    parser = argparse.ArgumentParser(description="Generate the marketing campaign chart.")
+    parser.add_argument('--stats-only', action='store_true',
+                        help='print the campaign summary without rendering chart.png '
+                             '(skips importing matplotlib, seaborn and PIL)')
+    parser.add_argument('--image-preset', choices=PNG_PRESETS, default=DEFAULT_PRESET,
+                        help=f'PNG size/CPU trade-off for chart.png (default: {DEFAULT_PRESET})')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure(args.trace, args.trace_format, args.trace_memory)
+
+    print("Generating marketing campaign data...")
+    with stage('generation'):
+        df = generate_marketing_data()
+    
+    print(f"Generated {len(df)} data points")
+    print(f"Campaign types: {df['Campaign_Type'].unique().tolist()}")
+    print(f"Spend range: ${df['Marketing_Spend_K'].min():.2f}K - ${df['Marketing_Spend_K'].max():.2f}K")
+    print(f"Conversion range: {df['Conversion_Rate'].min():.2f}% - {df['Conversion_Rate'].max():.2f}%")
+    
+    if args.stats_only:
+        print("\nStats-only run: skipping chart rendering")
+    else:
+        save_chart(df, args.image_preset)
     
     # Display summary statistics
     print("\n=== Campaign Performance Summary ===")
-    summary = df.groupby('Campaign_Type').agg({
-        'Marketing_Spend_K': ['mean', 'std'],
-        'Conversion_Rate': ['mean', 'std'],
-        'Engagement_Score': 'mean'
-    }).round(2)
+    with stage('aggregation'):
+        summary = df.groupby('Campaign_Type').agg({
+            'Marketing_Spend_K': ['mean', 'std'],
+            'Conversion_Rate': ['mean', 'std'],
+            'Engagement_Score': 'mean'
+        }).round(2)
     
     print(summary)
     
-    print("\nVisualization saved successfully!")
+    if not args.stats_only:
+        print("\nVisualization saved successfully!")
     print("Contact: 23f2004089@ds.study.iitm.ac.in")
 
+    instrumentation.finish()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
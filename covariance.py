@@ -0,0 +1,166 @@
+"""
+Streaming, Mergeable Covariance and Correlation
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CovarianceAccumulator:
+    """
+    Running count, mean vector and co-moment matrix for p numeric columns.
+
+    Chunks can be added one at a time and accumulators for disjoint row
+    sets can be merged exactly (pairwise update of Chan et al.), so the
+    covariance of a union never needs another pass over the rows.
+
+    Parameters:
+    -----------
+    n_features : int
+        Number of numeric columns tracked
+    """
+
+    def __init__(self, n_features):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.comoment = np.zeros((n_features, n_features))
+
+    @classmethod
+    def from_values(cls, values):
+        """Build an accumulator from a 2-D array of rows in one pass."""
+        values = np.asarray(values, dtype=float)
+        acc = cls(values.shape[1])
+        return acc.add_chunk(values)
+
+    def copy(self):
+        """Return an independent copy of this accumulator."""
+        acc = CovarianceAccumulator(len(self.mean))
+        acc.count = self.count
+        acc.mean = self.mean.copy()
+        acc.comoment = self.comoment.copy()
+        return acc
+
+    def add_chunk(self, values):
+        """
+        Fold a chunk of rows into the accumulator in place.
+
+        Rows containing NaN are dropped (listwise deletion).
+
+        Returns:
+        --------
+        CovarianceAccumulator
+            self, to allow chaining
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) == 0:
+            return self
+
+        chunk = CovarianceAccumulator(values.shape[1])
+        chunk.count = len(values)
+        chunk.mean = values.mean(axis=0)
+        centered = values - chunk.mean
+        chunk.comoment = centered.T @ centered
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Merge another accumulator (disjoint rows) into this one in place."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.comoment = other.comoment.copy()
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.comoment = (self.comoment + other.comoment
+                         + np.outer(delta, delta) * (self.count * other.count / total))
+        self.mean = self.mean + delta * (other.count / total)
+        self.count = total
+        return self
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def covariance(self, ddof=1):
+        """Return the covariance matrix (NaN when there are too few rows)."""
+        if self.count <= ddof:
+            return np.full_like(self.comoment, np.nan)
+        return self.comoment / (self.count - ddof)
+
+    def correlation(self):
+        """Return the Pearson correlation matrix."""
+        cov = self.covariance()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(np.diag(cov))
+            return cov / np.outer(std, std)
+
+
+class GroupedCovariance:
+    """
+    Per-group covariance partials for a fixed set of numeric columns.
+
+    Correlation for any subset of groups is combined from the cached
+    partials in O(k·p²) for k groups, independent of the number of rows.
+
+    Parameters:
+    -----------
+    columns : list of str
+        Numeric columns to track
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.groups = {}
+        self._combined = {}
+
+    @classmethod
+    def from_frame(cls, df, group_col, columns):
+        """Build per-group partials from a DataFrame."""
+        return cls(columns).add_frame(df, group_col)
+
+    def add_frame(self, df, group_col):
+        """Fold a new chunk of rows into the per-group partials."""
+        for group, part in df.groupby(group_col, sort=False):
+            acc = self.groups.get(group)
+            if acc is None:
+                acc = self.groups[group] = CovarianceAccumulator(len(self.columns))
+            acc.add_chunk(part[self.columns].to_numpy(dtype=float))
+        self._combined.clear()
+        return self
+
+    def _cached_combination(self, groups):
+        """Merged accumulator for ``groups``, shared with the cache; do not modify."""
+        key = frozenset(self.groups if groups is None else groups)
+        if key not in self._combined:
+            acc = CovarianceAccumulator(len(self.columns))
+            for group in key:
+                if group in self.groups:
+                    acc.merge(self.groups[group])
+            self._combined[key] = acc
+        return self._combined[key]
+
+    def combined(self, groups=None):
+        """
+        Return the merged accumulator for the given groups (all by default).
+
+        The result is a copy, so merging into it or adding chunks leaves
+        the cached combinations untouched.
+        """
+        return self._cached_combination(groups).copy()
+
+    def covariance(self, groups=None):
+        """Covariance matrix for the union of groups, as a DataFrame."""
+        return pd.DataFrame(self._cached_combination(groups).covariance(),
+                            index=self.columns, columns=self.columns)
+
+    def correlation(self, groups=None):
+        """Correlation matrix for the union of groups, as a DataFrame."""
+        return pd.DataFrame(self._cached_combination(groups).correlation(),
+                            index=self.columns, columns=self.columns)
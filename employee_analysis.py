@@ -4,12 +4,17 @@ Author: 23f2004089@ds.study.iitm.ac.in
 Date: December 2024
 """
 
+import argparse
+import base64
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from io import StringIO
 
+import instrumentation
+from image_encoding import DEFAULT_PRESET, ENCODING_PRESETS, PNG_PRESETS, encode_figure
+from instrumentation import stage
+
 def create_sample_data():
     """Create a realistic sample employee dataset."""
     np.random.seed(42)
@@ -29,8 +34,8 @@ def create_sample_data():
     
     return pd.DataFrame(data)
 
-def analyze_departments(df):
-    """Analyze department frequencies and create visualization."""
+def summarize_departments(df):
+    """Print department frequency statistics and return the counts."""
     
     print("=" * 60)
     print("EMPLOYEE DEPARTMENT ANALYSIS")
@@ -38,9 +43,11 @@ def analyze_departments(df):
     print(f"Analysis by: 23f2004089@ds.study.iitm.ac.in\n")
     
     # 1. Calculate frequency count for IT department
-    it_count = df[df['Department'] == 'IT'].shape[0]
-    total_employees = df.shape[0]
-    it_percentage = (it_count / total_employees) * 100
+    with stage('aggregation'):
+        it_count = df[df['Department'] == 'IT'].shape[0]
+        total_employees = df.shape[0]
+        it_percentage = (it_count / total_employees) * 100
+        dept_counts = df['Department'].value_counts()
     
     print("DEPARTMENT FREQUENCY ANALYSIS:")
     print("-" * 40)
@@ -49,56 +56,69 @@ def analyze_departments(df):
     print(f"IT Department Percentage: {it_percentage:.1f}%")
     print()
     
-    # 2. Calculate frequency for all departments
-    dept_counts = df['Department'].value_counts()
+    # 2. Frequency for all departments (computed above)
     print("DEPARTMENT DISTRIBUTION:")
     print("-" * 40)
     print(dept_counts)
     print()
     
+    return dept_counts
+
+def analyze_departments(df):
+    """Analyze department frequencies and create visualization."""
+    # Imported here so stats-only runs never load the plotting stack
+    import matplotlib.pyplot as plt
+    
+    dept_counts = summarize_departments(df)
+    
     # 3. Create histogram visualization
-    plt.style.use('seaborn-v0_8-darkgrid')
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-    
-    # Bar chart - Department Distribution
-    colors = ['#2E86AB' if dept == 'IT' else '#A23B72' for dept in dept_counts.index]
-    bars = ax1.bar(dept_counts.index, dept_counts.values, color=colors, edgecolor='black')
-    
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                f'{int(height)}', ha='center', va='bottom', fontweight='bold')
-    
-    ax1.set_title('Department Distribution - Employee Count', fontsize=14, fontweight='bold', pad=20)
-    ax1.set_xlabel('Department', fontsize=12, fontweight='bold')
-    ax1.set_ylabel('Number of Employees', fontsize=12, fontweight='bold')
-    ax1.tick_params(axis='x', rotation=45)
-    ax1.grid(axis='y', alpha=0.3)
-    
-    # Pie chart - Department Percentage
-    explode = [0.1 if dept == 'IT' else 0 for dept in dept_counts.index]
-    wedges, texts, autotexts = ax2.pie(dept_counts.values, labels=dept_counts.index, 
-                                      autopct='%1.1f%%', startangle=90,
-                                      colors=colors, explode=explode,
-                                      shadow=True)
-    
-    ax2.set_title('Department Distribution - Percentage', fontsize=14, fontweight='bold', pad=20)
-    
-    # Make autotexts bold
-    for autotext in autotexts:
-        autotext.set_color('white')
-        autotext.set_fontweight('bold')
-    
-    plt.suptitle(f'Employee Department Analysis\nContact: 23f2004089@ds.study.iitm.ac.in', 
-                fontsize=16, fontweight='bold', y=1.02)
-    plt.tight_layout()
+    with stage('layout'):
+        plt.style.use('seaborn-v0_8-darkgrid')
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    
+        # Bar chart - Department Distribution
+        colors = ['#2E86AB' if dept == 'IT' else '#A23B72' for dept in dept_counts.index]
+        bars = ax1.bar(dept_counts.index, dept_counts.values, color=colors, edgecolor='black')
+    
+        # Add value labels on bars
+        for bar in bars:
+            height = bar.get_height()
+            ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                    f'{int(height)}', ha='center', va='bottom', fontweight='bold')
+    
+        ax1.set_title('Department Distribution - Employee Count', fontsize=14, fontweight='bold', pad=20)
+        ax1.set_xlabel('Department', fontsize=12, fontweight='bold')
+        ax1.set_ylabel('Number of Employees', fontsize=12, fontweight='bold')
+        ax1.tick_params(axis='x', rotation=45)
+        ax1.grid(axis='y', alpha=0.3)
+    
+        # Pie chart - Department Percentage
+        explode = [0.1 if dept == 'IT' else 0 for dept in dept_counts.index]
+        wedges, texts, autotexts = ax2.pie(dept_counts.values, labels=dept_counts.index, 
+                                          autopct='%1.1f%%', startangle=90,
+                                          colors=colors, explode=explode,
+                                          shadow=True)
+    
+        ax2.set_title('Department Distribution - Percentage', fontsize=14, fontweight='bold', pad=20)
+    
+        # Make autotexts bold
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontweight('bold')
+    
+        plt.suptitle(f'Employee Department Analysis\nContact: 23f2004089@ds.study.iitm.ac.in', 
+                    fontsize=16, fontweight='bold', y=1.02)
+        plt.tight_layout()
+    
     
     return fig, dept_counts
 
-def save_as_html(df, fig, dept_counts):
+def save_as_html(df, fig, dept_counts, image_preset=DEFAULT_PRESET):
     """Save analysis results and visualization as HTML."""
     
+    with stage('image_encoding'):
+        encoded, figure_b64 = encode_figure_base64(fig, image_preset, measure_baseline=True)
+    
     html_content = f"""
     <!DOCTYPE html>
     <html lang="en">
@@ -225,7 +245,7 @@ def save_as_html(df, fig, dept_counts):
                 <h2>📊 Visualization</h2>
                 <p>The charts below visualize the department distribution:</p>
                 <div style="text-align: center;">
-                    <img src="data:image/png;base64,{fig_to_base64(fig)}" alt="Department Distribution Charts" style="max-width: 100%; border-radius: 8px;">
+                    <img src="data:{encoded.mime_type};base64,{figure_b64}" alt="Department Distribution Charts" style="max-width: 100%; border-radius: 8px;">
                 </div>
             </div>
             
@@ -245,48 +265,81 @@ def save_as_html(df, fig, dept_counts):
     """
     
     # Save HTML file
-    with open('employee_analysis.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with stage('html_writing'):
+        with open('employee_analysis.html', 'w', encoding='utf-8') as f:
+            f.write(html_content)
     
     print("=" * 60)
     print("HTML REPORT GENERATED:")
     print("-" * 40)
     print("File saved as: employee_analysis.html")
+    print(f"Embedded figure: {encoded.summary()}")
     print("Open in web browser to view the complete analysis report.")
 
-def fig_to_base64(fig):
-    """Convert matplotlib figure to base64 string for HTML embedding."""
-    from io import BytesIO
-    import base64
-    
-    buf = BytesIO()
-    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode('utf-8')
-    return img_str
+def encode_figure_base64(fig, image_preset=DEFAULT_PRESET, measure_baseline=False):
+    """
+    Encode a figure for HTML embedding.
+
+    Returns:
+    --------
+    tuple of (image_encoding.EncodedImage, str)
+        The encoded image (MIME type, size, savings) and its base64 text
+    """
+    encoded = encode_figure(fig, preset=image_preset, measure_baseline=measure_baseline,
+                            dpi=100, bbox_inches='tight')
+    return encoded, base64.b64encode(encoded.data).decode('utf-8')
 
-def main():
+def fig_to_base64(fig, image_preset=DEFAULT_PRESET):
+    """Convert matplotlib figure to base64 PNG string for HTML embedding."""
+    if ENCODING_PRESETS[image_preset]['format'] != 'png':
+        raise ValueError(f"fig_to_base64 produces PNG; choose one of {PNG_PRESETS}")
+    return encode_figure_base64(fig, image_preset)[1]
+
+def main(argv=None):
     """Main function to run the analysis."""
+    parser = argparse.ArgumentParser(description="Run the employee department analysis.")
+    parser.add_argument('--stats-only', action='store_true',
+                        help='print department counts without writing the HTML report or PNG '
+                             '(skips importing matplotlib and PIL)')
+    parser.add_argument('--image-preset', choices=PNG_PRESETS, default=DEFAULT_PRESET,
+                        help=f'encoding for department_distribution.png (default: {DEFAULT_PRESET})')
+    parser.add_argument('--embed-preset', choices=list(ENCODING_PRESETS), default=DEFAULT_PRESET,
+                        help=f'encoding for the figure embedded in the HTML report, '
+                             f'including webp/avif (default: {DEFAULT_PRESET})')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure(args.trace, args.trace_format, args.trace_memory)
     
     print("Starting Employee Department Analysis...")
     print("=" * 60)
     
     # 1. Create sample employee data
-    df = create_sample_data()
+    with stage('generation'):
+        df = create_sample_data()
     print("✅ Sample employee data created successfully")
     print(f"   Total records: {len(df)}")
     
+    if args.stats_only:
+        summarize_departments(df)
+        print("✅ Department counts completed (stats only, no files written)")
+        instrumentation.finish()
+        return
+    
     # 2. Analyze department frequencies
     fig, dept_counts = analyze_departments(df)
     print("✅ Department analysis completed")
     
     # 3. Save as HTML file
-    save_as_html(df, fig, dept_counts)
+    save_as_html(df, fig, dept_counts, image_preset=args.embed_preset)
     print("✅ HTML report generated successfully")
     
     # 4. Save visualization separately as PNG
-    fig.savefig('department_distribution.png', dpi=100, bbox_inches='tight')
+    with stage('png_save'):
+        encoded = encode_figure(fig, preset=args.image_preset, measure_baseline=True,
+                                dpi=100, bbox_inches='tight')
+        encoded.save('department_distribution.png')
     print("✅ Visualization saved as: department_distribution.png")
+    print(f"   {encoded.summary()}")
     
     print("=" * 60)
     print("ANALYSIS COMPLETE")
@@ -295,6 +348,8 @@ def main():
     print("1. employee_analysis.html - Complete interactive report")
     print("2. department_distribution.png - Visualization chart")
     print("\nFor questions: 23f2004089@ds.study.iitm.ac.in")
+    
+    instrumentation.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Optimized Image Encoding for Generated Charts
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+Matplotlib's Agg backend writes full-color PNGs with default zlib
+settings. The flat-color charts in this repository compress far better
+as palette PNGs, so rendered figures are re-encoded here using a named
+preset that trades file size against CPU time. PIL is imported only when
+an image is actually encoded.
+"""
+
+import time
+from io import BytesIO
+
+from instrumentation import stage
+
+# Preset name -> encoder settings. 'quantize' is False (keep full color),
+# 'lossless' (palette only when the image has <= 256 colors, exactly) or
+# True (near-lossless palette with 'colors' entries).
+ENCODING_PRESETS = {
+    'fast': {'format': 'png', 'quantize': False, 'compress_level': 1},
+    'lossless': {'format': 'png', 'quantize': 'lossless', 'compress_level': 9,
+                 'optimize': True},
+    'balanced': {'format': 'png', 'quantize': True, 'colors': 256, 'compress_level': 6},
+    'small': {'format': 'png', 'quantize': True, 'colors': 128, 'compress_level': 9,
+              'optimize': True},
+    'webp': {'format': 'webp', 'lossless': True, 'quality': 100, 'method': 6},
+    'avif': {'format': 'avif', 'quality': 80, 'speed': 6},
+}
+PNG_PRESETS = [name for name, opts in ENCODING_PRESETS.items() if opts['format'] == 'png']
+DEFAULT_PRESET = 'balanced'
+
+MIME_TYPES = {'png': 'image/png', 'webp': 'image/webp', 'avif': 'image/avif'}
+
+
+class EncodedImage:
+    """Encoded image bytes plus the numbers needed to report the savings."""
+
+    def __init__(self, data, fmt, preset, baseline_bytes, render_seconds, encode_seconds):
+        self.data = data
+        self.format = fmt
+        self.preset = preset
+        self.baseline_bytes = baseline_bytes
+        self.render_seconds = render_seconds
+        self.encode_seconds = encode_seconds
+
+    @property
+    def mime_type(self):
+        return MIME_TYPES[self.format]
+
+    @property
+    def bytes_saved(self):
+        """Bytes saved against the default savefig PNG, or None if not measured."""
+        if self.baseline_bytes is None:
+            return None
+        return self.baseline_bytes - len(self.data)
+
+    def summary(self):
+        """One-line report of size, savings (when measured) and encode time."""
+        savings = ''
+        if self.baseline_bytes is not None:
+            ratio = self.baseline_bytes / len(self.data) if self.data else float('inf')
+            savings = (f"saved {self.bytes_saved:,} of {self.baseline_bytes:,} "
+                       f"({ratio:.1f}x smaller), ")
+        return (f"{self.format.upper()} ({self.preset}): {len(self.data):,} bytes, "
+                f"{savings}encoded in {self.encode_seconds * 1000:.0f} ms")
+
+    def save(self, path):
+        """Write the encoded bytes to ``path``."""
+        with open(path, 'wb') as f:
+            f.write(self.data)
+
+
+def render_figure(fig, **savefig_kwargs):
+    """
+    Rasterize a figure to a PIL image.
+
+    ``savefig_kwargs`` (dpi, bbox_inches, facecolor, ...) are passed to
+    ``fig.savefig``; the intermediate PNG is written uncompressed so this
+    step costs rasterization only. The image keeps the RGBA mode Agg
+    produces; see ``drop_opaque_alpha``.
+    """
+    from PIL import Image
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png', pil_kwargs={'compress_level': 0}, **savefig_kwargs)
+    buf.seek(0)
+    img = Image.open(buf)
+    img.load()
+    return img
+
+
+def drop_opaque_alpha(img):
+    """Return ``img`` as RGB if its alpha channel is fully opaque; it only costs bytes."""
+    if img.mode == 'RGBA' and img.getextrema()[3][0] == 255:
+        return img.convert('RGB')
+    return img
+
+
+def _palette(img, opts):
+    """Return the palette version of ``img`` per the preset, or ``img`` unchanged."""
+    if not opts.get('quantize'):
+        return img
+
+    from PIL import Image
+
+    method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    if opts['quantize'] == 'lossless':
+        if img.getcolors(256) is None:
+            return img
+        paletted = img.quantize(colors=256, method=method, dither=Image.Dither.NONE)
+        # Only keep the palette if it reproduces every pixel exactly
+        if paletted.convert(img.mode).tobytes() != img.tobytes():
+            return img
+        return paletted
+
+    return img.quantize(colors=opts.get('colors', 256), method=method,
+                        dither=Image.Dither.NONE)
+
+
+def encode_image(img, preset=DEFAULT_PRESET):
+    """
+    Encode a PIL image with a preset from ENCODING_PRESETS.
+
+    Returns:
+    --------
+    bytes
+        The encoded image
+    """
+    if preset not in ENCODING_PRESETS:
+        raise ValueError(f"Unknown image preset '{preset}', "
+                         f"expected one of {list(ENCODING_PRESETS)}")
+    from PIL import features
+
+    opts = ENCODING_PRESETS[preset]
+    fmt = opts['format']
+    if fmt != 'png' and not features.check(fmt):
+        raise RuntimeError(f"This Pillow build has no {fmt.upper()} support; "
+                           f"use one of the PNG presets {PNG_PRESETS}")
+
+    buf = BytesIO()
+    if fmt == 'png':
+        _palette(img, opts).save(buf, format='PNG', compress_level=opts['compress_level'],
+                                 optimize=opts.get('optimize', False))
+    else:
+        save_kwargs = {key: value for key, value in opts.items() if key != 'format'}
+        img.save(buf, format=fmt.upper(), **save_kwargs)
+    return buf.getvalue()
+
+
+def encode_figure(fig, preset=DEFAULT_PRESET, measure_baseline=False, **savefig_kwargs):
+    """
+    Rasterize ``fig`` and encode it with ``preset``.
+
+    With ``measure_baseline`` the rasterized RGBA frame is also encoded
+    with default PNG settings, as plain ``fig.savefig(..., format='png')``
+    writes it, so callers can report the bytes saved. That costs one extra
+    encode (no second render), so leave it off on hot paths.
+
+    Returns:
+    --------
+    EncodedImage
+    """
+    start = time.perf_counter()
+    with stage('rasterization'):
+        img = render_figure(fig, **savefig_kwargs)
+    render_seconds = time.perf_counter() - start
+
+    baseline_bytes = None
+    if measure_baseline:
+        with stage('baseline_encoding'):
+            baseline = BytesIO()
+            img.save(baseline, format='PNG')
+            baseline_bytes = len(baseline.getvalue())
+    img = drop_opaque_alpha(img)
+
+    start = time.perf_counter()
+    with stage('encoding'):
+        data = encode_image(img, preset)
+    encode_seconds = time.perf_counter() - start
+
+    return EncodedImage(data, ENCODING_PRESETS[preset]['format'], preset,
+                        baseline_bytes, render_seconds, encode_seconds)
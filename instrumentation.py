@@ -0,0 +1,257 @@
+"""
+Stage-Level Timing and Memory Instrumentation
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+Wrap pipeline stages in ``with stage('name'):`` to record wall time, CPU
+time and peak RSS. Tracing is off unless a script's ``main()`` enables it
+with ``configure()``; until then ``stage`` returns a shared no-op context
+manager, so importing a module never turns tracing on.
+
+Enable with the environment:
+    PIPELINE_TRACE=trace.json python chart.py
+    PIPELINE_TRACE=trace.json PIPELINE_TRACE_FORMAT=chrome python employee_analysis.py
+
+or from a script's command line (``--trace PATH --trace-format chrome``).
+The ``json`` format is a list of stage records; ``chrome`` is the Chrome
+trace-event format understood by chrome://tracing and Perfetto.
+
+Per-stage Python allocations are traced with tracemalloc only when asked
+for (``--trace-memory`` or PIPELINE_TRACE_MEMORY=1). tracemalloc slows
+allocation-heavy code several times over, so leave it off when the wall
+and CPU times matter.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TRACE_ENV = 'PIPELINE_TRACE'
+FORMAT_ENV = 'PIPELINE_TRACE_FORMAT'
+MEMORY_ENV = 'PIPELINE_TRACE_MEMORY'
+FORMATS = ('json', 'chrome')
+
+
+class _NullStage:
+    """Context manager used for every stage while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _max_rss_kb():
+    """Peak resident set size of this process in KiB, if available."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB elsewhere
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+class Tracer:
+    """
+    Collect stage records and write them as JSON or Chrome trace events.
+
+    Parameters:
+    -----------
+    path : str
+        File the trace is written to
+    fmt : str
+        'json' or 'chrome'
+    memory : bool
+        Also trace Python allocations per stage with tracemalloc
+    """
+
+    def __init__(self, path, fmt='json', memory=False):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown trace format '{fmt}', expected one of {FORMATS}")
+        self.path = path
+        self.fmt = fmt
+        self.memory = memory
+        self.records = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        """Context manager recording one stage."""
+        return _Stage(self, name)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def write(self):
+        """Write all records collected so far to ``self.path``."""
+        with self._lock:
+            records = sorted(self.records, key=lambda r: r['start_s'])
+        if self.fmt == 'chrome':
+            payload = {
+                'traceEvents': [
+                    {
+                        'name': r['stage'],
+                        'cat': 'pipeline',
+                        'ph': 'X',
+                        'ts': r['start_s'] * 1e6,
+                        'dur': r['wall_s'] * 1e6,
+                        'pid': r['pid'],
+                        'tid': r['thread'],
+                        'args': {key: r[key] for key in
+                                 ('cpu_s', 'start_traced_bytes', 'peak_traced_bytes',
+                                  'peak_delta_bytes', 'max_rss_kb') if key in r},
+                    }
+                    for r in records
+                ],
+                'displayTimeUnit': 'ms',
+            }
+        else:
+            payload = {'stages': records}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        return self.path
+
+
+class _Stage:
+    def __init__(self, tracer, name):
+        self._tracer = tracer
+        self.name = name
+        self.peak = 0
+
+    def __enter__(self):
+        stack = self._tracer._stack()
+        if self._tracer.memory:
+            if stack:
+                # Fold the parent's peak so far in before resetting for this stage
+                parent = stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self.start_traced = tracemalloc.get_traced_memory()[0]
+        stack.append(self)
+        self._start = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._start
+        cpu = time.thread_time() - self._cpu
+        stack = self._tracer._stack()
+        stack.pop()
+
+        record = {
+            'stage': '/'.join([s.name for s in stack] + [self.name]),
+            'start_s': self._start - self._tracer._origin,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'max_rss_kb': _max_rss_kb(),
+            'pid': os.getpid(),
+            'thread': threading.get_ident(),
+            'error': exc_type.__name__ if exc_type else None,
+        }
+        if self._tracer.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+            record.update({
+                'start_traced_bytes': self.start_traced,
+                'peak_traced_bytes': self.peak,
+                'peak_delta_bytes': self.peak - self.start_traced,
+            })
+        self._tracer._record(record)
+        return False
+
+
+_tracer = None
+
+
+def configure(path=None, fmt=None, memory=False):
+    """
+    Enable tracing to ``path``; call from a script's ``main()``.
+
+    ``memory`` adds tracemalloc allocation tracing to every stage.
+
+    Does nothing when ``path`` is empty. The trace is written at
+    interpreter exit and can also be flushed early with ``write_trace()``.
+
+    Returns:
+    --------
+    Tracer or None
+    """
+    global _tracer
+    if not path:
+        return _tracer
+    fmt = fmt or 'json'
+    if _tracer is not None and (_tracer.path, _tracer.fmt, _tracer.memory) == (path, fmt, memory):
+        return _tracer
+    if _tracer is None:
+        atexit.register(write_trace)
+    _tracer = Tracer(path, fmt, memory)
+    return _tracer
+
+
+def enabled():
+    """Return True if tracing is active."""
+    return _tracer is not None
+
+
+def stage(name):
+    """Context manager timing a named stage; a no-op while tracing is off."""
+    if _tracer is None:
+        return _NULL_STAGE
+    return _tracer.stage(name)
+
+
+def write_trace():
+    """Write the active trace file, if tracing is on. Returns its path."""
+    if _tracer is None:
+        return None
+    return _tracer.write()
+
+
+def finish():
+    """Write the trace, if tracing is on, and say where it went."""
+    path = write_trace()
+    if path:
+        print(f"Stage trace written to {path}")
+    return path
+
+
+def add_arguments(parser):
+    """
+    Add --trace/--trace-format/--trace-memory options to an argparse parser.
+
+    Their defaults come from $PIPELINE_TRACE, $PIPELINE_TRACE_FORMAT and
+    $PIPELINE_TRACE_MEMORY, so the environment is only consulted by
+    command line entry points.
+    """
+    parser.add_argument('--trace', metavar='PATH', default=os.environ.get(TRACE_ENV),
+                        help=f'write a stage timing trace (or set ${TRACE_ENV})')
+    parser.add_argument('--trace-format', choices=FORMATS,
+                        default=os.environ.get(FORMAT_ENV),
+                        help=f'trace file format (default: json, or ${FORMAT_ENV})')
+    parser.add_argument('--trace-memory', action='store_true',
+                        default=os.environ.get(MEMORY_ENV, '') not in ('', '0'),
+                        help=f'also trace per-stage Python allocations with tracemalloc; '
+                             f'slows the traced run (or set ${MEMORY_ENV}=1)')
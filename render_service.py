@@ -0,0 +1,428 @@
+"""
+Local Chart Rendering Service
+Author: 23f2004089@ds.study.iitm.ac.in
+Date: October 2026
+
+A resident HTTP service that keeps pandas/matplotlib/seaborn/PIL imported,
+styles set and the font cache built in a pool of worker processes, so
+dashboard chart requests skip the cold start of ``python chart.py``.
+
+Endpoints:
+    POST /render/marketing     {"data": [...rows...], "preset": "balanced"}  -> image bytes
+    POST /render/departments   {"data": [...rows...], "preset": "balanced"}  -> image bytes
+    GET  /metrics              latency percentiles, queue depth, counters (JSON)
+    GET  /health               "ok"
+
+Omitting "data" renders the scripts' own sample datasets
+("n_samples" sets the marketing sample size). Malformed payloads are
+rejected with 400.
+
+Usage:
+    python render_service.py --port 8765 --workers 2
+    python render_service.py --self-check    # warm output matches a cold CLI render
+    curl -s -X POST localhost:8765/render/marketing -d '{"n_samples": 400}' > chart.png
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from chart import CAMPAIGN_PALETTE
+from image_encoding import DEFAULT_PRESET, ENCODING_PRESETS
+
+# Endpoint -> (savefig options) used when encoding; mirrors each script's main()
+RENDER_KINDS = {
+    'marketing': {'dpi': 80, 'facecolor': 'white', 'edgecolor': 'none'},
+    'departments': {'dpi': 100, 'bbox_inches': 'tight'},
+}
+
+# Endpoint -> columns every "data" row must have; numeric ones must be numbers
+REQUIRED_COLUMNS = {
+    'marketing': ('Marketing_Spend_K', 'Conversion_Rate', 'Campaign_Type', 'Engagement_Score'),
+    'departments': ('Department',),
+}
+NUMERIC_COLUMNS = ('Marketing_Spend_K', 'Conversion_Rate', 'Engagement_Score')
+# generate_marketing_data draws n_samples // 4 rows per campaign type
+MIN_SAMPLES = len(CAMPAIGN_PALETTE)
+MAX_SAMPLES = 100_000
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _warm_worker():
+    """
+    Process-pool initializer: import the plotting stack and render once.
+
+    The throwaway renders build matplotlib's font cache and load the
+    seaborn/matplotlib style modules, so the first real request is as
+    fast as any other.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    for kind in RENDER_KINDS:
+        render_chart(kind, None, 'fast')
+
+
+def render_chart(kind, records=None, preset=DEFAULT_PRESET, n_samples=200):
+    """
+    Render one chart and return the encoded image bytes and MIME type.
+
+    Parameters:
+    -----------
+    kind : str
+        'marketing' (chart.create_marketing_scatterplot) or
+        'departments' (employee_analysis.analyze_departments)
+    records : list of dict, optional
+        Rows of the input DataFrame; the sample dataset is used when omitted
+    preset : str
+        Image encoding preset from image_encoding.ENCODING_PRESETS
+    n_samples : int
+        Marketing sample size when ``records`` is omitted
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    import chart
+    import employee_analysis
+    from image_encoding import encode_figure
+
+    # The scripts set seaborn/matplotlib styles globally. Start every render
+    # from the rc file defaults, as a fresh `python chart.py` would, and
+    # restore them afterwards so no style carries over to the next request.
+    with matplotlib.rc_context():
+        matplotlib.rc_file_defaults()
+        if kind == 'marketing':
+            df = pd.DataFrame.from_records(records) if records else \
+                chart.generate_marketing_data(n_samples)
+            fig = chart.create_marketing_scatterplot(df)
+        else:
+            df = pd.DataFrame.from_records(records) if records else \
+                employee_analysis.create_sample_data()
+            with contextlib.redirect_stdout(io.StringIO()):
+                fig, _ = employee_analysis.analyze_departments(df)
+
+        try:
+            encoded = encode_figure(fig, preset=preset, **RENDER_KINDS[kind])
+        finally:
+            plt.close(fig)
+    return encoded.data, encoded.mime_type
+
+
+def validate_payload(kind, payload):
+    """Raise ValueError describing the first problem with a render request."""
+    if payload.get('preset', DEFAULT_PRESET) not in ENCODING_PRESETS:
+        raise ValueError(f"unknown preset, expected one of {list(ENCODING_PRESETS)}")
+
+    n_samples = payload.get('n_samples', 200)
+    if isinstance(n_samples, bool) or not isinstance(n_samples, int) \
+            or not MIN_SAMPLES <= n_samples <= MAX_SAMPLES:
+        raise ValueError(f"n_samples must be an integer from {MIN_SAMPLES} to {MAX_SAMPLES}")
+
+    records = payload.get('data')
+    if records is None:
+        return
+    if not isinstance(records, list) or not records \
+            or not all(isinstance(row, dict) for row in records):
+        raise ValueError('data must be a non-empty list of row objects')
+    for index, row in enumerate(records):
+        missing = [col for col in REQUIRED_COLUMNS[kind] if col not in row]
+        if missing:
+            raise ValueError(f"data[{index}] is missing column(s) {', '.join(missing)}")
+        for col in NUMERIC_COLUMNS:
+            value = row.get(col)
+            if col in row and (isinstance(value, bool) or not isinstance(value, (int, float))
+                               or not math.isfinite(value)):
+                raise ValueError(f"data[{index}].{col} must be a finite number")
+        if kind == 'marketing' and row['Campaign_Type'] not in CAMPAIGN_PALETTE:
+            raise ValueError(f"data[{index}].Campaign_Type must be one of {list(CAMPAIGN_PALETTE)}")
+        if kind == 'departments' and \
+                not (isinstance(row['Department'], str) and row['Department'].strip()):
+            raise ValueError(f"data[{index}].Department must be a non-empty string")
+
+
+class QueueFull(Exception):
+    """Raised when the render queue is at capacity."""
+
+
+class RenderService:
+    """
+    Bounded pool of warm render workers plus latency and queue metrics.
+
+    Parameters:
+    -----------
+    workers : int
+        Number of worker processes
+    max_queue : int
+        Requests allowed to wait beyond those being rendered before new
+        ones are rejected
+    timeout : float
+        Seconds to wait for a render before giving up
+    """
+
+    def __init__(self, workers=2, max_queue=16, timeout=60.0):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        self._lock = threading.Lock()
+        self._in_system = 0
+        self._latencies = {kind: deque(maxlen=1000) for kind in RENDER_KINDS}
+        self._counts = {'ok': 0, 'error': 0, 'rejected': 0, 'invalid': 0}
+
+    def warm_up(self):
+        """Block until every worker process has started and warmed up."""
+        futures = [self._pool.submit(time.sleep, 0) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    @property
+    def queue_depth(self):
+        """Requests waiting for a free worker."""
+        with self._lock:
+            return max(0, self._in_system - self.workers)
+
+    def render(self, kind, payload):
+        """Render a chart for a request payload; returns (bytes, mime type)."""
+        with self._lock:
+            if self._in_system >= self.workers + self.max_queue:
+                self._counts['rejected'] += 1
+                raise QueueFull(f"{self._in_system} requests in flight")
+            self._in_system += 1
+
+        start = time.perf_counter()
+        try:
+            future = self._pool.submit(render_chart, kind, payload.get('data'),
+                                       payload.get('preset', DEFAULT_PRESET),
+                                       payload.get('n_samples', 200))
+        except BaseException:
+            self._release()
+            with self._lock:
+                self._counts['error'] += 1
+            raise
+        # The slot is held until the worker is done, even if this request
+        # times out first, so the queue bound reflects real worker load
+        future.add_done_callback(self._release)
+        try:
+            result = future.result(timeout=self.timeout)
+        except BaseException:
+            future.cancel()  # frees the slot now if the render never started
+            with self._lock:
+                self._counts['error'] += 1
+            raise
+
+        with self._lock:
+            self._counts['ok'] += 1
+            self._latencies[kind].append(time.perf_counter() - start)
+        return result
+
+    def record_invalid(self):
+        """Count a request refused with 400 before it reached a worker."""
+        with self._lock:
+            self._counts['invalid'] += 1
+
+    def _release(self, future=None):
+        with self._lock:
+            self._in_system -= 1
+
+    def metrics(self):
+        """Latency percentiles (ms) per endpoint, queue depth and counters."""
+        with self._lock:
+            latencies = {kind: sorted(samples) for kind, samples in self._latencies.items()}
+            counts = dict(self._counts)
+            in_system = self._in_system
+
+        def percentile(samples, pct):
+            # Nearest-rank percentile
+            index = max(0, int(round(pct / 100 * len(samples))) - 1)
+            return samples[index] * 1000
+
+        return {
+            'queue_depth': max(0, in_system - self.workers),
+            'in_flight': min(in_system, self.workers),
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'requests': counts,
+            'latency_ms': {
+                kind: {
+                    'count': len(samples),
+                    'p50': percentile(samples, 50),
+                    'p90': percentile(samples, 90),
+                    'p99': percentile(samples, 99),
+                }
+                for kind, samples in latencies.items() if samples
+            },
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """HTTP front end; ``server.service`` is the RenderService."""
+
+    def _send(self, status, body, content_type='application/json'):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, indent=2).encode()
+        elif isinstance(body, str):
+            body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send(200, self.server.service.metrics())
+        elif self.path == '/health':
+            self._send(200, 'ok', 'text/plain')
+        else:
+            self._send(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self):
+        prefix = '/render/'
+        kind = self.path[len(prefix):] if self.path.startswith(prefix) else None
+        if kind not in RENDER_KINDS:
+            self._send(404, {'error': f'unknown path {self.path}'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError('payload must be a JSON object')
+        except ValueError as exc:
+            self.server.service.record_invalid()
+            self._send(400, {'error': f'invalid JSON payload: {exc}'})
+            return
+        try:
+            validate_payload(kind, payload)
+        except ValueError as exc:
+            self.server.service.record_invalid()
+            self._send(400, {'error': str(exc)})
+            return
+
+        try:
+            data, mime_type = self.server.service.render(kind, payload)
+        except QueueFull as exc:
+            self._send(503, {'error': f'render queue full ({exc})'})
+        except FutureTimeoutError:
+            self._send(504, {'error': 'render timed out'})
+        except Exception as exc:
+            self._send(500, {'error': f'{type(exc).__name__}: {exc}'})
+        else:
+            self._send(200, data, mime_type)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def serve(host='127.0.0.1', port=8765, workers=2, max_queue=16, timeout=60.0, quiet=False):
+    """Start the service and block until interrupted."""
+    service = RenderService(workers=workers, max_queue=max_queue, timeout=timeout)
+    print(f"Warming up {workers} render worker(s)...")
+    service.warm_up()
+
+    server = ThreadingHTTPServer((host, port), RenderHandler)
+    server.service = service
+    server.quiet = quiet
+    print(f"✓ Rendering service listening on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+def _cold_render(kind, preset):
+    """Render ``kind`` in a fresh interpreter, like running the script itself."""
+    code = ("import sys, render_service; "
+            f"data, _ = render_service.render_chart({kind!r}, None, {preset!r}); "
+            "sys.stdout.buffer.write(data)")
+    proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                          check=True, env=dict(os.environ, MPLBACKEND='Agg'))
+    return proc.stdout
+
+
+def self_check(preset='fast'):
+    """
+    Check that a warm worker renders the same images as a cold process.
+
+    Every kind is rendered twice on one warmed worker, so each render
+    follows one of another kind, and compared pixel for pixel with a cold
+    render of the sample data.
+
+    Returns:
+    --------
+    list of str
+        Descriptions of every mismatch; empty when the output matches
+    """
+    from PIL import Image
+
+    def decode(data):
+        img = Image.open(io.BytesIO(data))
+        return img.size, img.convert('RGBA').tobytes()
+
+    service = RenderService(workers=1, max_queue=0)
+    try:
+        service.warm_up()
+        warm = [(kind, service.render(kind, {'preset': preset})[0])
+                for _ in range(2) for kind in RENDER_KINDS]
+    finally:
+        service.shutdown()
+
+    problems = []
+    for kind in RENDER_KINDS:
+        cold_size, cold_pixels = decode(_cold_render(kind, preset))
+        for attempt, (_, data) in enumerate(row for row in warm if row[0] == kind):
+            size, pixels = decode(data)
+            if size != cold_size:
+                problems.append(f"{kind} render {attempt + 1}: {size[0]}x{size[1]} pixels, "
+                                f"cold CLI render is {cold_size[0]}x{cold_size[1]}")
+            elif pixels != cold_pixels:
+                problems.append(f"{kind} render {attempt + 1}: pixels differ from cold CLI render")
+        print(f"{kind}: {cold_size[0]}x{cold_size[1]} pixels checked")
+    return problems
+
+
+def main(argv=None):
+    """Command line entry point for the rendering service."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--host', default='127.0.0.1', help='bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port (default: 8765)')
+    parser.add_argument('--workers', type=int, default=2, help='render processes (default: 2)')
+    parser.add_argument('--max-queue', type=int, default=16,
+                        help='waiting requests allowed before returning 503 (default: 16)')
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help='seconds per render before returning 504 (default: 60)')
+    parser.add_argument('--quiet', action='store_true', help='disable per-request logging')
+    parser.add_argument('--self-check', action='store_true',
+                        help='compare warm-worker output with a cold render and exit')
+    args = parser.parse_args(argv)
+    if args.self_check:
+        problems = self_check()
+        for problem in problems:
+            print(f"✗ {problem}")
+        if problems:
+            return 1
+        print("✓ Service output matches the CLI")
+        return 0
+    serve(args.host, args.port, args.workers, args.max_queue, args.timeout, args.quiet)
+
+
+if __name__ == "__main__":
+    sys.exit(main())